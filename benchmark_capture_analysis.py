@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+패킷 캡처 분석 처리량 벤치마크
+합성 pcap 파일(루프백 포트 2000/2001)을 생성하여 UEPacketCapture.analyze_packets의
+파서 백엔드별 처리량(packets/sec, MB/sec)과 최대 RSS(분석 프로세스, tshark 등 자식 프로세스)를
+cold/cached 조건에서 측정합니다.
+tcpdump/tshark 없이 오프라인으로 실행됩니다. (tshark가 없으면 해당 백엔드는 건너뜀)
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from capture_ue_packets import UEPacketCapture, PARSER_BACKENDS
+
+SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+MIN_SIZE = 10 * 1024 ** 2   # 10MB
+MAX_SIZE = 10 * 1024 ** 3   # 10GB
+
+def parse_size(text):
+    """'10MB', '1GB' 형식의 크기 문자열을 바이트로 변환"""
+    text = text.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+def format_size(size_bytes):
+    """바이트를 사람이 읽기 쉬운 크기 문자열로 변환"""
+    for unit in ("GB", "MB", "KB"):
+        if size_bytes >= SIZE_UNITS[unit]:
+            return f"{size_bytes / SIZE_UNITS[unit]:g}{unit}"
+    return f"{size_bytes}B"
+
+def build_packet(src_port, dst_port, payload, use_udp):
+    """Ethernet/IPv4/TCP(UDP) 루프백 프레임 생성"""
+    if use_udp:
+        segment = struct.pack("!HHHH", src_port, dst_port, 8 + len(payload), 0) + payload
+        protocol = 17
+    else:
+        # 데이터 오프셋 5 (20바이트), PSH|ACK
+        segment = struct.pack("!HHIIBBHHH", src_port, dst_port, 1, 1, 0x50, 0x18, 65535, 0, 0) + payload
+        protocol = 6
+
+    ip_header = struct.pack(
+        "!BBHHHBBH4s4s",
+        0x45, 0, 20 + len(segment), 0, 0x4000, 64, protocol, 0,
+        b"\x7f\x00\x00\x01", b"\x7f\x00\x00\x01"
+    )
+    # Linux lo 인터페이스는 MAC 주소가 0인 Ethernet 헤더를 사용
+    ethernet_header = b"\x00" * 12 + b"\x08\x00"
+    return ethernet_header + ip_header + segment
+
+def generate_synthetic_pcap(filename, target_size, payload_size=256, seed=42):
+    """
+    지정된 크기의 합성 pcap 파일 생성
+
+    Args:
+        filename: 출력 pcap 파일 경로
+        target_size: 목표 파일 크기 (바이트)
+        payload_size: 평균 페이로드 크기 (바이트)
+        seed: 난수 시드 (같은 시드는 같은 파일을 생성)
+    """
+    rng = random.Random(seed)
+
+    # 재사용할 패킷 템플릿 (UE -> eNB, eNB -> UE 양방향, TCP/UDP 혼합)
+    templates = []
+    for i in range(256):
+        payload = bytes(rng.getrandbits(8) for _ in range(rng.randint(payload_size // 2, payload_size * 3 // 2)))
+        if i % 2 == 0:
+            src_port, dst_port = 40000 + i, 2001
+        else:
+            src_port, dst_port = 2000, 40000 + i
+        templates.append(build_packet(src_port, dst_port, payload, use_udp=(i % 4 == 3)))
+
+    record_header = struct.Struct("<IIII")
+    ts_usec = 1_700_000_000 * 1_000_000
+    written = 0
+    packet_count = 0
+
+    with open(filename, 'wb') as f:
+        # pcap 전역 헤더 (마이크로초 해상도, Ethernet)
+        f.write(struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1))
+        written += 24
+
+        chunk = []
+        while written < target_size:
+            frame = templates[rng.randrange(len(templates))]
+            ts_usec += rng.randint(10, 2000)
+            chunk.append(record_header.pack(ts_usec // 1_000_000, ts_usec % 1_000_000, len(frame), len(frame)))
+            chunk.append(frame)
+            written += 16 + len(frame)
+            packet_count += 1
+
+            if len(chunk) >= 8192:
+                f.write(b"".join(chunk))
+                chunk = []
+
+        if chunk:
+            f.write(b"".join(chunk))
+
+    return packet_count
+
+def prepare_cache_state(filename, cold):
+    """페이지 캐시 상태 준비 (cold: 캐시에서 제거, cached: 미리 읽기)"""
+    if cold:
+        with open(filename, 'rb') as f:
+            os.fsync(f.fileno())
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    else:
+        with open(filename, 'rb') as f:
+            while f.read(16 * 1024 * 1024):
+                pass
+
+def run_single_benchmark(filename, parser, cold, tshark_timeout=None):
+    """
+    단일 벤치마크 실행 (별도 프로세스에서 실행되어 최대 RSS가 실행별로 분리됨)
+    tshark 백엔드는 기본적으로 제한 시간 없이 실행하여 큰 파일에서도 실패 대신 실제 처리 시간을 측정합니다.
+    """
+    prepare_cache_state(filename, cold)
+
+    capture = UEPacketCapture()
+    capture.capture_file = filename
+
+    start = time.perf_counter()
+    analysis_result = capture.analyze_packets(parser, tshark_timeout)
+    elapsed = time.perf_counter() - start
+
+    # Linux에서 ru_maxrss는 KB 단위
+    # tshark 백엔드는 대부분의 작업을 자식 프로세스가 하므로 종료된 자식(tshark)의 최대 RSS도 기록
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    child_peak_rss_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+    return {
+        "success": analysis_result is not None,
+        "elapsed": elapsed,
+        "packets": analysis_result["analysis_info"]["total_packets"] if analysis_result else 0,
+        "peak_rss_mb": peak_rss_mb,
+        "child_peak_rss_mb": child_peak_rss_mb
+    }
+
+def available_parsers(requested):
+    """실행 가능한 파서 백엔드 목록"""
+    parsers = []
+    for parser in requested:
+        if parser == "tshark" and not shutil.which("tshark"):
+            print("tshark가 설치되어 있지 않아 tshark 백엔드를 건너뜁니다.")
+            continue
+        parsers.append(parser)
+    return parsers
+
+def run_benchmarks(sizes, parsers, workdir, repeat=1, payload_size=256, seed=42, keep_files=False,
+                   tshark_timeout=None):
+    """전체 벤치마크 실행 (tshark_timeout: tshark 실행 제한 시간, None이면 제한 없음)"""
+    os.makedirs(workdir, exist_ok=True)
+    results = []
+
+    for size in sizes:
+        filename = os.path.join(workdir, f"synthetic_{format_size(size)}_p{payload_size}_s{seed}.pcap")
+
+        if os.path.exists(filename) and os.path.getsize(filename) >= size:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 기존 합성 pcap 재사용: {filename}")
+        else:
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 합성 pcap 생성 중: {filename} ({format_size(size)})")
+            packet_count = generate_synthetic_pcap(filename, size, payload_size, seed)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 생성 완료: {packet_count}개 패킷")
+
+        file_mb = os.path.getsize(filename) / (1024 * 1024)
+
+        for parser in parsers:
+            for cold in (True, False):
+                for run in range(repeat):
+                    # 실행마다 새 프로세스를 사용하여 최대 RSS를 독립적으로 측정
+                    with ProcessPoolExecutor(max_workers=1) as executor:
+                        measurement = executor.submit(run_single_benchmark, filename, parser, cold,
+                                                      tshark_timeout).result()
+
+                    elapsed = measurement["elapsed"]
+                    result = {
+                        "size": format_size(size),
+                        "file_mb": file_mb,
+                        "parser": parser,
+                        "cache": "cold" if cold else "cached",
+                        "run": run + 1,
+                        "success": measurement["success"],
+                        "packets": measurement["packets"],
+                        "elapsed": elapsed,
+                        "packets_per_sec": measurement["packets"] / elapsed if elapsed > 0 else 0,
+                        "mb_per_sec": file_mb / elapsed if elapsed > 0 else 0,
+                        "peak_rss_mb": measurement["peak_rss_mb"],
+                        "child_peak_rss_mb": measurement["child_peak_rss_mb"]
+                    }
+                    results.append(result)
+
+                    print(f"[{datetime.now().strftime('%H:%M:%S')}] {result['size']:>6} | {parser:<6} | "
+                          f"{result['cache']:<6} | {result['packets_per_sec']:>12.0f} pkt/s | "
+                          f"{result['mb_per_sec']:>8.1f} MB/s | RSS {result['peak_rss_mb']:>8.1f} MB"
+                          f" (자식 {result['child_peak_rss_mb']:.1f} MB)")
+
+        if not keep_files:
+            os.remove(filename)
+
+    return results
+
+def format_results_table(results):
+    """벤치마크 결과 표 생성"""
+    lines = [
+        f"{'크기':<8}{'파서':<8}{'캐시':<8}{'패킷 수':>12}{'시간(초)':>10}{'pkt/s':>14}{'MB/s':>10}{'RSS(MB)':>10}{'자식RSS(MB)':>12}",
+        "-" * 92
+    ]
+    for r in results:
+        status = "" if r["success"] else "  (실패)"
+        lines.append(
+            f"{r['size']:<8}{r['parser']:<8}{r['cache']:<8}{r['packets']:>12}{r['elapsed']:>10.2f}"
+            f"{r['packets_per_sec']:>14.0f}{r['mb_per_sec']:>10.1f}{r['peak_rss_mb']:>10.1f}"
+            f"{r['child_peak_rss_mb']:>12.1f}{status}"
+        )
+    return "\n".join(lines)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="패킷 캡처 분석 처리량 벤치마크")
+    parser.add_argument("--sizes", default="10MB,100MB",
+                       help="합성 pcap 크기 목록 (쉼표 구분, 10MB ~ 10GB)")
+    parser.add_argument("--parsers", default=",".join(PARSER_BACKENDS), help="측정할 파서 백엔드 (쉼표 구분)")
+    parser.add_argument("--repeat", type=int, default=1, help="조건별 반복 횟수")
+    parser.add_argument("--payload-size", type=int, default=256, help="평균 페이로드 크기 (바이트)")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--workdir", default="/tmp/capture_benchmark", help="합성 pcap 저장 디렉토리")
+    parser.add_argument("--keep-files", action="store_true", help="합성 pcap 파일 유지 (다음 실행에서 재사용)")
+    parser.add_argument("--tshark-timeout", type=float, default=None, help="tshark 실행 제한 시간 (초, 기본값: 제한 없음)")
+
+    args = parser.parse_args()
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    for size in sizes:
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            parser.error(f"크기는 10MB ~ 10GB 범위여야 합니다: {format_size(size)}")
+
+    requested = [p.strip() for p in args.parsers.split(",") if p.strip()]
+    for p in requested:
+        if p not in PARSER_BACKENDS:
+            parser.error(f"지원하지 않는 파서: {p}")
+
+    parsers = available_parsers(requested)
+    if not parsers:
+        print("실행 가능한 파서 백엔드가 없습니다.")
+        return
+
+    print("=== 패킷 캡처 분석 벤치마크 ===")
+    print(f"크기: {', '.join(format_size(s) for s in sizes)}")
+    print(f"파서: {', '.join(parsers)}")
+    print("=" * 50)
+
+    results = run_benchmarks(sizes, parsers, args.workdir, args.repeat, args.payload_size, args.seed, args.keep_files,
+                             args.tshark_timeout)
+
+    print("\n=== 벤치마크 결과 ===")
+    print(format_results_table(results))
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_file = f"capture_benchmark_{timestamp}.json"
+    try:
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                "benchmark_info": {
+                    "timestamp": datetime.now().isoformat(),
+                    "sizes": [format_size(s) for s in sizes],
+                    "parsers": parsers,
+                    "repeat": args.repeat,
+                    "payload_size": args.payload_size,
+                    "seed": args.seed
+                },
+                "results": results
+            }, f, indent=2, ensure_ascii=False)
+        print(f"\n벤치마크 결과 저장: {output_file}")
+    except Exception as e:
+        print(f"결과 저장 오류: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,45 @@ import time
 import signal
 import sys
 import os
-from datetime import datetime
+import socket
+import struct
+from datetime import datetime, timezone
+
+# 지원하는 패킷 파서 백엔드
+PARSER_BACKENDS = ("tshark", "python")
+
+# pcap 링크 타입별 링크 계층 헤더 길이
+LINK_HEADER_LENGTHS = {
+    0: 4,     # BSD loopback
+    1: 14,    # Ethernet (Linux lo)
+    101: 0,   # Raw IP
+    113: 16,  # Linux cooked capture (SLL)
+}
+
+def format_frame_time(ts_sec, ts_nsec):
+    """pcap 타임스탬프를 tshark frame.time 형식 문자열로 변환"""
+    local_time = datetime.fromtimestamp(ts_sec).astimezone()
+    return f"{local_time.strftime('%b %d, %Y %H:%M:%S')}.{ts_nsec:09d} {local_time.strftime('%Z')}"
+
+def parse_frame_time(frame_time):
+    """
+    tshark frame.time 형식 문자열을 epoch 나노초로 변환
+    (예: "Oct 20, 2025 17:52:39.123456789 KST", 시간대 약어는 UTC/GMT 외에는 로컬 시간으로 해석하며,
+    서머타임 해제로 같은 로컬 시각이 두 번 나오는 구간은 약어(예: EDT/EST)로 구분)
+    """
+    parts = frame_time.split()
+    month, day, year, clock = parts[:4]
+    zone = parts[4] if len(parts) > 4 else ""
+    
+    hms, _, fraction = clock.partition(".")
+    base = datetime.strptime(f"{month} {day} {year} {hms}", "%b %d, %Y %H:%M:%S")
+    if zone in ("UTC", "GMT"):
+        base = base.replace(tzinfo=timezone.utc)
+    elif (zone and base.astimezone().strftime("%Z") != zone
+          and base.replace(fold=1).astimezone().strftime("%Z") == zone):
+        base = base.replace(fold=1)
+    
+    return int(base.timestamp()) * 1_000_000_000 + int((fraction + "000000000")[:9])
 
 class UEPacketCapture:
     def __init__(self):
@@ -76,75 +114,196 @@ class UEPacketCapture:
             return True
         return False
     
-    def analyze_packets(self):
-        """캡처된 패킷 분석"""
+    def analyze_packets(self, parser="tshark", tshark_timeout=30):
+        """
+        캡처된 패킷 분석
+        
+        Args:
+            parser: 패킷 파서 백엔드 ("tshark" 또는 "python")
+            tshark_timeout: tshark 실행 제한 시간 (초, None이면 제한 없음)
+        """
         if not self.capture_file or not os.path.exists(self.capture_file):
             print("캡처 파일이 없습니다.")
             return None
         
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] 패킷 분석 시작...")
+        if parser not in PARSER_BACKENDS:
+            print(f"지원하지 않는 파서: {parser}")
+            return None
+        
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 패킷 분석 시작... (파서: {parser})")
+        
+        try:
+            if parser == "tshark":
+                packets = self.parse_with_tshark(tshark_timeout)
+            else:
+                packets = self.parse_with_python()
+            
+            if packets is None:
+                return None
+            
+            analysis_result = {
+                "analysis_info": {
+                    "timestamp": datetime.now().isoformat(),
+                    "capture_file": self.capture_file,
+                    "total_packets": len(packets),
+                    "parser": parser,
+                    "description": "UE RRC 메시지 분석 결과"
+                },
+                "rrc_messages": [],
+                "all_packets": packets
+            }
+            
+            # RRC 메시지 필터링 (페이로드가 있는 패킷)
+            for packet_data in packets:
+                if packet_data["payload"] and len(packet_data["payload"]) > 0:
+                    analysis_result["rrc_messages"].append(packet_data)
+            
+            return analysis_result
+                
+        except Exception as e:
+            print(f"패킷 분석 오류: {e}")
+            return None
+    
+    def parse_with_tshark(self, timeout=30):
+        """
+        tshark로 패킷 파싱
         
-        # tshark로 패킷 분석
+        Args:
+            timeout: tshark 실행 제한 시간 (초, None이면 제한 없음)
+        """
         cmd = [
             "tshark",
             "-r", self.capture_file,
             "-T", "json",
             "-e", "frame.time",
+            "-e", "frame.time_epoch",
+            "-e", "frame.len",
             "-e", "ip.src",
             "-e", "ip.dst",
+            "-e", "ip.proto",
             "-e", "tcp.srcport",
             "-e", "tcp.dstport",
+            "-e", "udp.srcport",
+            "-e", "udp.dstport",
             "-e", "tcp.payload",
             "-e", "udp.payload"
         ]
         
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        
+        if result.returncode != 0:
+            print(f"tshark 오류: {result.stderr}")
+            return None
+        
+        packets = []
+        for packet in json.loads(result.stdout):
+            packet_info = packet.get("_source", {}).get("layers", {})
+            
+            packet_data = {
+                "timestamp": packet_info.get("frame.time", [""])[0],
+                "timestamp_epoch": packet_info.get("frame.time_epoch", [""])[0],
+                "length": packet_info.get("frame.len", [""])[0],
+                "protocol": packet_info.get("ip.proto", [""])[0],
+                "src_ip": packet_info.get("ip.src", [""])[0],
+                "dst_ip": packet_info.get("ip.dst", [""])[0],
+                "src_port": packet_info.get("tcp.srcport", [""])[0],
+                "dst_port": packet_info.get("tcp.dstport", [""])[0],
+                "payload": packet_info.get("tcp.payload", [""])[0]
+            }
             
-            if result.returncode == 0:
-                packets_data = json.loads(result.stdout)
+            # UDP 포트/페이로드도 확인
+            if not packet_data["src_port"]:
+                packet_data["src_port"] = packet_info.get("udp.srcport", [""])[0]
+                packet_data["dst_port"] = packet_info.get("udp.dstport", [""])[0]
+            if not packet_data["payload"]:
+                packet_data["payload"] = packet_info.get("udp.payload", [""])[0]
+            
+            packets.append(packet_data)
+        
+        return packets
+    
+    def parse_with_python(self):
+        """
+        순수 Python pcap 파서
+        tshark 없이 동작하며, tshark 백엔드와 같은 형식의 패킷 목록을 반환합니다.
+        (포트는 tshark와 동일하게 TCP/UDP 패킷에만 채웁니다)
+        """
+        packets = []
+        
+        with open(self.capture_file, 'rb') as f:
+            header = f.read(24)
+            if len(header) < 24:
+                print("pcap 헤더가 올바르지 않습니다.")
+                return None
+            
+            magic = header[:4]
+            if magic in (b"\xd4\xc3\xb2\xa1", b"\x4d\x3c\xb2\xa1"):
+                endian = "<"
+            elif magic in (b"\xa1\xb2\xc3\xd4", b"\xa1\xb2\x3c\x4d"):
+                endian = ">"
+            else:
+                print("pcapng 등 지원하지 않는 캡처 형식입니다.")
+                return None
+            
+            # 나노초 해상도 pcap 여부
+            nanosecond = magic in (b"\x4d\x3c\xb2\xa1", b"\xa1\xb2\x3c\x4d")
+            linktype = struct.unpack(endian + "I", header[20:24])[0]
+            if linktype not in LINK_HEADER_LENGTHS:
+                print(f"지원하지 않는 링크 타입: {linktype}")
+                return None
+            link_offset = LINK_HEADER_LENGTHS[linktype]
+            
+            record_header = struct.Struct(endian + "IIII")
+            
+            while True:
+                raw = f.read(16)
+                if len(raw) < 16:
+                    break
+                
+                ts_sec, ts_frac, incl_len, orig_len = record_header.unpack(raw)
+                frame = f.read(incl_len)
+                if len(frame) < incl_len:
+                    break
                 
-                analysis_result = {
-                    "analysis_info": {
-                        "timestamp": datetime.now().isoformat(),
-                        "capture_file": self.capture_file,
-                        "total_packets": len(packets_data),
-                        "description": "UE RRC 메시지 분석 결과"
-                    },
-                    "rrc_messages": [],
-                    "all_packets": []
+                ts_nsec = ts_frac if nanosecond else ts_frac * 1000
+                packet_data = {
+                    "timestamp": format_frame_time(ts_sec, ts_nsec),
+                    "timestamp_epoch": f"{ts_sec}.{ts_nsec:09d}",
+                    "length": str(orig_len),
+                    "protocol": "",
+                    "src_ip": "",
+                    "dst_ip": "",
+                    "src_port": "",
+                    "dst_port": "",
+                    "payload": ""
                 }
                 
-                for packet in packets_data:
-                    packet_info = packet.get("_source", {}).get("layers", {})
-                    
-                    packet_data = {
-                        "timestamp": packet_info.get("frame.time", [""])[0],
-                        "src_ip": packet_info.get("ip.src", [""])[0],
-                        "dst_ip": packet_info.get("ip.dst", [""])[0],
-                        "src_port": packet_info.get("tcp.srcport", [""])[0],
-                        "dst_port": packet_info.get("tcp.dstport", [""])[0],
-                        "payload": packet_info.get("tcp.payload", [""])[0]
-                    }
-                    
-                    # UDP 페이로드도 확인
-                    if not packet_data["payload"]:
-                        packet_data["payload"] = packet_info.get("udp.payload", [""])[0]
+                # IPv4만 분석 (srsRAN 루프백 트래픽)
+                ip = frame[link_offset:]
+                if len(ip) >= 20 and ip[0] >> 4 == 4:
+                    ihl = (ip[0] & 0x0F) * 4
+                    total_length = struct.unpack("!H", ip[2:4])[0]
+                    protocol = ip[9]
+                    packet_data["protocol"] = str(protocol)
+                    packet_data["src_ip"] = socket.inet_ntoa(ip[12:16])
+                    packet_data["dst_ip"] = socket.inet_ntoa(ip[16:20])
+                    segment = ip[ihl:total_length] if total_length else ip[ihl:]
                     
-                    analysis_result["all_packets"].append(packet_data)
-                    
-                    # RRC 메시지 필터링 (페이로드가 있는 패킷)
-                    if packet_data["payload"] and len(packet_data["payload"]) > 0:
-                        analysis_result["rrc_messages"].append(packet_data)
+                    if protocol == 6 and len(segment) >= 20:
+                        src_port, dst_port = struct.unpack("!HH", segment[:4])
+                        data_offset = (segment[12] >> 4) * 4
+                        packet_data["src_port"] = str(src_port)
+                        packet_data["dst_port"] = str(dst_port)
+                        packet_data["payload"] = segment[data_offset:].hex()
+                    elif protocol == 17 and len(segment) >= 8:
+                        src_port, dst_port = struct.unpack("!HH", segment[:4])
+                        packet_data["src_port"] = str(src_port)
+                        packet_data["dst_port"] = str(dst_port)
+                        packet_data["payload"] = segment[8:].hex()
                 
-                return analysis_result
-            else:
-                print(f"tshark 오류: {result.stderr}")
-                return None
-                
-        except Exception as e:
-            print(f"패킷 분석 오류: {e}")
-            return None
+                packets.append(packet_data)
+        
+        return packets
     
     def save_analysis(self, analysis_result):
         """분석 결과 저장"""
@@ -165,6 +324,31 @@ class UEPacketCapture:
             print(f"파일 저장 오류: {e}")
             return None
 
+    def save_flow_table(self, analysis_result, port=2001):
+        """
+        흐름 통계 테이블 생성 및 컬럼 형식(.npz) 저장
+        
+        Args:
+            analysis_result: analyze_packets 결과
+            port: 초당 고유 흐름 수를 셀 대상 포트
+        """
+        from flow_table import FlowTable
+        
+        try:
+            table = FlowTable.from_packets(analysis_result["all_packets"])
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = table.save(f"ue_flow_table_{timestamp}.npz")
+            
+            _, counts = table.flows_per_second(port)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] 흐름 테이블 저장: {output_file} (흐름 {len(table.flows)}개)")
+            if len(counts):
+                print(f"포트 {port} 초당 고유 흐름 수: 최대 {counts.max()}, 평균 {counts.mean():.1f}")
+            return output_file
+            
+        except Exception as e:
+            print(f"흐름 테이블 저장 오류: {e}")
+            return None
+
 def signal_handler(signum, frame):
     """시그널 핸들러"""
     print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 시그널 {signum} 수신, 캡처 중지...")
@@ -172,13 +356,13 @@ def signal_handler(signum, frame):
 
 def main():
     """메인 함수"""
-import (
-	"disCall/services"
     import argparse
     
     parser = argparse.ArgumentParser(description="UE RRC 메시지 캡처 및 분석")
     parser.add_argument("--duration", type=int, default=60, help="캡처 지속 시간 (초)")
     parser.add_argument("--analyze", help="기존 캡처 파일 분석")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="tshark", help="패킷 파서 백엔드")
+    parser.add_argument("--flow-port", type=int, default=2001, help="흐름 통계에서 초당 고유 흐름 수를 셀 포트")
     
     args = parser.parse_args()
     
@@ -198,11 +382,12 @@ import (
         
         try:
             # 패킷 분석
-            analysis_result = capture.analyze_packets()
+            analysis_result = capture.analyze_packets(args.parser)
             
             if analysis_result:
                 # 결과 저장
                 output_file = capture.save_analysis(analysis_result)
+                capture.save_flow_table(analysis_result, args.flow_port)
                 
                 if output_file:
                     print(f"\n=== 분석 완료 ===")
@@ -243,11 +428,12 @@ import (
             capture.stop_capture()
             
             # 패킷 분석
-            analysis_result = capture.analyze_packets()
+            analysis_result = capture.analyze_packets(args.parser)
             
             if analysis_result:
                 # 결과 저장
                 output_file = capture.save_analysis(analysis_result)
+                capture.save_flow_table(analysis_result, args.flow_port)
                 
                 if output_file:
                     print(f"\n=== 캡처 완료 ===")
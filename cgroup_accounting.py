@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+cgroup v2 기반 대상 리소스 측정 백엔드
+호스트 전체 메모리(페이지 캐시, 무관한 프로세스 포함) 대신 대상 프로세스가 속한 cgroup의
+memory.current, memory.stat, memory.events(oom/oom_kill), cpu.stat, pids.current를 읽어
+대상별 정확한 수치와 실제 OOM kill 발생 여부를 제공합니다.
+"""
+
+import os
+import time
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# 하위 cgroup에 memory 컨트롤러를 켜기 위해 모니터 프로세스를 옮겨 둘 리프 cgroup 이름
+MONITOR_LEAF = "lte_monitor"
+
+# memory.stat에서 수집할 항목
+MEMORY_STAT_KEYS = ("anon", "file", "shmem", "sock", "kernel_stack", "slab")
+
+def is_cgroup_v2(path):
+    """cgroup v2 디렉토리 여부 (v1 또는 일반 tmpfs 디렉토리에는 cgroup.controllers가 없음)"""
+    return os.path.exists(os.path.join(path, "cgroup.controllers"))
+
+def cgroup_path_of(pid="self"):
+    """프로세스가 속한 cgroup v2 디렉토리 경로 (/proc/<pid>/cgroup의 0:: 항목)"""
+    try:
+        with open(f"/proc/{pid}/cgroup", 'r') as f:
+            for line in f:
+                if line.startswith("0::"):
+                    path = os.path.join(CGROUP_ROOT, line.strip()[3:].lstrip("/"))
+                    return path if is_cgroup_v2(path) else None
+    except OSError:
+        pass
+    return None
+
+def read_cgroup_file(cgroup_path, name):
+    """cgroup 파일 내용 읽기 (없으면 빈 문자열)"""
+    try:
+        with open(os.path.join(cgroup_path, name), 'r') as f:
+            return f.read()
+    except OSError:
+        return ""
+
+def write_cgroup_file(cgroup_path, name, value):
+    """cgroup 파일 쓰기"""
+    with open(os.path.join(cgroup_path, name), 'w') as f:
+        f.write(str(value))
+
+def memory_cgroup_parent(parent=None):
+    """
+    memory 컨트롤러가 하위 cgroup에 위임된 부모 cgroup 준비
+    cgroup v2는 자체 프로세스가 있는 (루트가 아닌) cgroup에서 하위 컨트롤러를 켤 수 없으므로,
+    parent를 지정하지 않으면 현재 프로세스를 리프 cgroup(MONITOR_LEAF)으로 옮긴 뒤
+    원래 cgroup의 cgroup.subtree_control에 +memory를 설정하고 그 cgroup을 부모로 사용합니다.
+
+    Args:
+        parent: 위임된 부모 cgroup 경로 (None이면 현재 프로세스의 cgroup 사용)
+
+    Returns:
+        하위 cgroup을 생성할 부모 cgroup 경로
+
+    Raises:
+        OSError: memory 컨트롤러를 위임할 수 없는 경우
+    """
+    if parent:
+        if not is_cgroup_v2(parent):
+            raise OSError(f"cgroup v2 디렉토리가 아닙니다: {parent}")
+        if "memory" not in read_cgroup_file(parent, "cgroup.subtree_control").split():
+            try:
+                write_cgroup_file(parent, "cgroup.subtree_control", "+memory")
+            except OSError as e:
+                raise OSError(f"{parent}에서 memory 컨트롤러를 활성화할 수 없습니다: {e}")
+        return parent
+
+    current = cgroup_path_of("self")
+    if not current:
+        raise OSError("현재 프로세스의 cgroup v2 경로를 찾을 수 없습니다.")
+
+    # 이전 호출에서 이미 리프로 옮겨 둔 경우
+    if os.path.basename(current) == MONITOR_LEAF:
+        upper = os.path.dirname(current)
+        if "memory" in read_cgroup_file(upper, "cgroup.subtree_control").split():
+            return upper
+
+    if "memory" in read_cgroup_file(current, "cgroup.subtree_control").split():
+        return current
+    if "memory" not in read_cgroup_file(current, "cgroup.controllers").split():
+        raise OSError(f"memory 컨트롤러가 위임되지 않았습니다: {current}")
+
+    # 실제 루트 cgroup은 프로세스가 있어도 하위 컨트롤러를 켤 수 있음
+    try:
+        write_cgroup_file(current, "cgroup.subtree_control", "+memory")
+        return current
+    except OSError:
+        pass
+
+    leaf = os.path.join(current, MONITOR_LEAF)
+    try:
+        os.makedirs(leaf, exist_ok=True)
+        write_cgroup_file(leaf, "cgroup.procs", os.getpid())
+        write_cgroup_file(current, "cgroup.subtree_control", "+memory")
+        return current
+    except OSError as e:
+        # 다른 프로세스가 남아 있으면 활성화할 수 없으므로 원래 cgroup으로 복귀
+        try:
+            write_cgroup_file(current, "cgroup.procs", os.getpid())
+            os.rmdir(leaf)
+        except OSError:
+            pass
+        raise OSError(f"{current}에 다른 프로세스가 있어 memory 컨트롤러를 활성화할 수 없습니다 "
+                      f"(--cgroup-parent로 위임된 cgroup을 지정하세요): {e}")
+
+def read_mem_total_bytes():
+    """호스트 전체 메모리 (/proc/meminfo MemTotal)"""
+    try:
+        with open("/proc/meminfo", 'r') as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def parse_flat_keyed(text):
+    """'key value' 줄 형식의 cgroup 파일 파싱"""
+    values = {}
+    for line in text.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            try:
+                values[parts[0]] = int(parts[1])
+            except ValueError:
+                pass
+    return values
+
+class CgroupAccounting:
+    def __init__(self, cgroup_path):
+        """
+        cgroup v2 측정 백엔드
+
+        Args:
+            cgroup_path: 측정할 cgroup 디렉토리 경로
+        """
+        self.cgroup_path = cgroup_path
+        self.fds = {}
+        self.mem_total = read_mem_total_bytes()
+        self.cpu_count = os.cpu_count() or 1
+        self.memory_max = None
+        self.created = False
+        self.attached_pid = None
+        self.return_cgroups = ()
+
+        # CPU 사용률 계산용 이전 값
+        self.last_cpu_usec = None
+        self.last_sample_time = None
+
+        # 샘플마다 open/close하지 않도록 파일 디스크립터를 유지하고 pread로 읽음
+        for name in ("memory.current", "memory.stat", "memory.events", "cpu.stat", "pids.current", "memory.max"):
+            try:
+                self.fds[name] = os.open(os.path.join(cgroup_path, name), os.O_RDONLY)
+            except OSError:
+                pass
+
+        if "memory.current" not in self.fds:
+            self.close()
+            raise OSError(f"cgroup v2 memory 컨트롤러를 사용할 수 없습니다: {cgroup_path}")
+
+        memory_max = self.read("memory.max")
+        if memory_max and memory_max.strip() != "max":
+            self.memory_max = int(memory_max)
+
+    @classmethod
+    def for_pid(cls, pid):
+        """대상 프로세스가 이미 속한 cgroup 탐색"""
+        cgroup_path = cgroup_path_of(pid)
+        if not cgroup_path:
+            raise OSError(f"PID {pid}의 cgroup v2 경로를 찾을 수 없습니다.")
+        return cls(cgroup_path)
+
+    @classmethod
+    def attach(cls, pid, memory_max_mb=None, parent=None):
+        """
+        대상 프로세스를 새 하위 cgroup으로 이동시킨 후 측정
+
+        Args:
+            pid: 대상 프로세스 PID
+            memory_max_mb: 설정할 memory.max (MB, None이면 제한 없음)
+            parent: 위임된 부모 cgroup 경로 (None이면 memory_cgroup_parent가 준비)
+        """
+        original = cgroup_path_of(pid)
+        parent = memory_cgroup_parent(parent)
+
+        cgroup_path = os.path.join(parent, f"lte_target_{pid}")
+        os.makedirs(cgroup_path, exist_ok=True)
+
+        # memory 컨트롤러가 하위 cgroup에 위임되어 있어야 memory.*가 생성됨
+        if not os.path.exists(os.path.join(cgroup_path, "memory.max")):
+            os.rmdir(cgroup_path)
+            raise OSError(f"memory 컨트롤러가 위임되지 않았습니다: {parent}")
+
+        try:
+            if memory_max_mb:
+                write_cgroup_file(cgroup_path, "memory.max", int(memory_max_mb * 1024 * 1024))
+            write_cgroup_file(cgroup_path, "cgroup.procs", pid)
+        except OSError:
+            os.rmdir(cgroup_path)
+            raise
+
+        accounting = cls(cgroup_path)
+        accounting.created = True
+        accounting.attached_pid = pid
+        # 정리 시 대상을 되돌릴 cgroup (원래 cgroup에 하위 컨트롤러가 켜졌으면 모니터 리프로)
+        accounting.return_cgroups = tuple(path for path in (original, os.path.join(parent, MONITOR_LEAF))
+                                          if path and path != cgroup_path)
+        return accounting
+
+    def read(self, name):
+        """cgroup 파일 내용 읽기 (없으면 None)"""
+        fd = self.fds.get(name)
+        if fd is None:
+            return None
+        try:
+            return os.pread(fd, 65536, 0).decode()
+        except OSError:
+            return None
+
+    def sample(self):
+        """cgroup 리소스 샘플 수집"""
+        now = time.monotonic()
+
+        memory_current = int(self.read("memory.current") or 0)
+        memory_stat = parse_flat_keyed(self.read("memory.stat") or "")
+        memory_events = parse_flat_keyed(self.read("memory.events") or "")
+        cpu_stat = parse_flat_keyed(self.read("cpu.stat") or "")
+        pids_current = self.read("pids.current")
+
+        # CPU 사용률: usage_usec 변화량 / 경과 시간 (전체 코어 기준 0~100%)
+        cpu_percent = 0.0
+        cpu_usec = cpu_stat.get("usage_usec")
+        if cpu_usec is not None and self.last_cpu_usec is not None and now > self.last_sample_time:
+            cpu_percent = (cpu_usec - self.last_cpu_usec) / ((now - self.last_sample_time) * 1e6) / self.cpu_count * 100
+        self.last_cpu_usec = cpu_usec
+        self.last_sample_time = now
+
+        # 메모리 사용률: memory.max가 있으면 그 기준, 없으면 호스트 전체 메모리 기준
+        memory_limit = self.memory_max or self.mem_total
+        memory_percent = memory_current / memory_limit * 100 if memory_limit else 0.0
+
+        result = {
+            "memory_mb": memory_current / (1024 * 1024),
+            "memory_percent": memory_percent,
+            "memory_limit_mb": memory_limit / (1024 * 1024),
+            "cpu_percent": cpu_percent,
+            "pids": int(pids_current) if pids_current else 0,
+            "oom": memory_events.get("oom", 0),
+            "oom_kills": memory_events.get("oom_kill", 0)
+        }
+        for key in MEMORY_STAT_KEYS:
+            result[f"{key}_mb"] = memory_stat.get(key, 0) / (1024 * 1024)
+
+        return result
+
+    def close(self):
+        """파일 디스크립터 정리 (attach로 생성한 cgroup은 대상을 원래 cgroup으로 되돌린 후 삭제)"""
+        for fd in self.fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fds = {}
+
+        if not self.created:
+            return
+        self.created = False
+
+        if self.attached_pid and os.path.exists(f"/proc/{self.attached_pid}"):
+            for destination in self.return_cgroups:
+                try:
+                    write_cgroup_file(destination, "cgroup.procs", self.attached_pid)
+                    break
+                except OSError:
+                    continue
+
+        # 종료된 프로세스가 cgroup에서 완전히 빠질 때까지 잠시 재시도
+        for _ in range(20):
+            try:
+                os.rmdir(self.cgroup_path)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(0.05)
+        print(f"cgroup을 삭제하지 못해 남겨 둡니다 (memory.max 유지): {self.cgroup_path}")
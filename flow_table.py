@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+캡처 트래픽 흐름(flow) 통계 테이블
+analyze_packets의 all_packets(문자열 필드 dict 목록)를 NumPy 구조화 배열 패킷 테이블로 한 번 변환한 뒤,
+5-튜플(프로토콜, 양 끝점 IP/포트) 기준 양방향 흐름 테이블(패킷/바이트 수, 최초/최종 시각,
+도착 간격 백분위, 방향)을 벡터 연산으로 계산하고 컬럼 형식(.npz)으로 저장합니다.
+"초당 포트 2001에 도달한 고유 흐름 수" 같은 질의도 dict 순회 없이 배열 연산으로 처리합니다.
+"""
+
+import argparse
+import json
+import socket
+import struct
+
+import numpy as np
+
+from capture_ue_packets import parse_frame_time
+
+PACKET_DTYPE = np.dtype([
+    ("ts_ns", np.int64),
+    ("length", np.uint32),
+    ("protocol", np.uint8),
+    ("src_ip", np.uint32),
+    ("dst_ip", np.uint32),
+    ("src_port", np.uint16),
+    ("dst_port", np.uint16),
+    ("flow_id", np.int64),
+    ("forward", np.bool_)
+])
+
+FLOW_DTYPE = np.dtype([
+    ("protocol", np.uint8),
+    ("src_ip", np.uint32),
+    ("dst_ip", np.uint32),
+    ("src_port", np.uint16),
+    ("dst_port", np.uint16),
+    ("packets", np.int64),
+    ("bytes", np.int64),
+    ("fwd_packets", np.int64),
+    ("fwd_bytes", np.int64),
+    ("rev_packets", np.int64),
+    ("rev_bytes", np.int64),
+    ("first_seen_ns", np.int64),
+    ("last_seen_ns", np.int64),
+    ("iat_p50_ms", np.float64),
+    ("iat_p99_ms", np.float64),
+    ("direction", np.uint8)
+])
+
+# 흐름 방향 (순방향 = 흐름의 첫 패킷 방향)
+DIRECTION_ONEWAY = 1
+DIRECTION_BIDIRECTIONAL = 2
+DIRECTION_NAMES = {DIRECTION_ONEWAY: "단방향", DIRECTION_BIDIRECTIONAL: "양방향"}
+
+PROTOCOL_NAMES = {1: "ICMP", 6: "TCP", 17: "UDP", 132: "SCTP"}
+
+def ip_to_int(address):
+    """IPv4 문자열 -> 정수 (비어 있거나 IPv4가 아니면 0)"""
+    try:
+        return struct.unpack("!I", socket.inet_aton(address))[0]
+    except OSError:
+        return 0
+
+def int_to_ip(value):
+    """정수 -> IPv4 문자열"""
+    return socket.inet_ntoa(struct.pack("!I", int(value)))
+
+def to_int(value):
+    """tshark 문자열 필드 -> 정수 (비어 있으면 0)"""
+    return int(value) if value else 0
+
+def parse_frame_times(frame_times):
+    """
+    frame.time 문자열 목록 -> epoch 나노초 배열
+    같은 초에 속한 패킷은 초 단위 부분의 파싱 결과를 재사용 (strptime 호출을 초당 1회로 제한)
+    """
+    seconds_cache = {}
+    result = np.empty(len(frame_times), dtype=np.int64)
+    for index, frame_time in enumerate(frame_times):
+        head, _, rest = frame_time.partition(".")
+        fraction, _, zone = rest.partition(" ")
+        key = (head, zone)
+        base = seconds_cache.get(key)
+        if base is None:
+            base = seconds_cache[key] = parse_frame_time(f"{head} {zone}")
+        result[index] = base + int((fraction + "000000000")[:9])
+    return result
+
+def parse_epoch_times(epoch_times):
+    """
+    frame.time_epoch 문자열 목록 -> epoch 나노초 배열
+    (예: "1760950359.123456789", 부동소수점 변환 없이 정수부/소수부를 나눠 나노초까지 정확히 변환)
+    """
+    result = np.empty(len(epoch_times), dtype=np.int64)
+    for index, epoch_time in enumerate(epoch_times):
+        seconds, _, fraction = epoch_time.partition(".")
+        result[index] = int(seconds) * 1_000_000_000 + int((fraction + "000000000")[:9])
+    return result
+
+def distinct_flow_counts(groups, flow_ids, group_count=None):
+    """
+    그룹(초, 버킷 등)별 고유 흐름 수
+    (그룹, 흐름) 쌍을 단일 정수 키로 묶어 정렬 후 경계만 세므로 해시 기반 np.unique보다 빠릅니다.
+    """
+    if len(groups) == 0:
+        return np.zeros(group_count or 0, dtype=np.int64)
+    flow_span = int(flow_ids.max()) + 1
+    keys = np.sort(groups.astype(np.int64) * flow_span + flow_ids)
+    distinct = keys[np.concatenate(([True], keys[1:] != keys[:-1]))]
+    return np.bincount(distinct // flow_span, minlength=group_count or 0)
+
+def group_percentile(values, group_starts, group_sizes, percentile):
+    """
+    그룹별로 정렬된 값 배열에서 그룹별 백분위 (nearest-rank, 빈 그룹은 NaN)
+
+    Args:
+        values: 그룹 순서, 그룹 내 오름차순으로 정렬된 값
+        group_starts: 그룹 시작 인덱스
+        group_sizes: 그룹 크기
+        percentile: 백분위 (0~100)
+    """
+    result = np.full(len(group_sizes), np.nan)
+    present = group_sizes > 0
+    offsets = np.ceil(group_sizes[present] * percentile / 100).astype(np.int64) - 1
+    result[present] = values[group_starts[present] + np.maximum(offsets, 0)]
+    return result
+
+class FlowTable:
+    def __init__(self, packets, flows):
+        """
+        흐름 통계 테이블
+
+        Args:
+            packets: PACKET_DTYPE 구조화 배열 (시각순, flow_id는 flows 인덱스)
+            flows: FLOW_DTYPE 구조화 배열
+        """
+        self.packets = packets
+        self.flows = flows
+
+    @classmethod
+    def from_packets(cls, packet_dicts):
+        """analyze_packets의 all_packets 목록으로 흐름 테이블 생성"""
+        packets = np.zeros(len(packet_dicts), dtype=PACKET_DTYPE)
+        # 시간대 해석이 필요 없는 epoch 시각이 있으면 우선 사용 (이전 결과 파일은 frame.time으로 대체)
+        if all(packet.get("timestamp_epoch") for packet in packet_dicts):
+            packets["ts_ns"] = parse_epoch_times([packet["timestamp_epoch"] for packet in packet_dicts])
+        else:
+            packets["ts_ns"] = parse_frame_times([packet["timestamp"] for packet in packet_dicts])
+        packets["length"] = [to_int(packet.get("length")) or len(packet.get("payload", "")) // 2
+                             for packet in packet_dicts]
+        packets["protocol"] = [to_int(packet.get("protocol")) for packet in packet_dicts]
+        packets["src_ip"] = [ip_to_int(packet.get("src_ip", "")) for packet in packet_dicts]
+        packets["dst_ip"] = [ip_to_int(packet.get("dst_ip", "")) for packet in packet_dicts]
+        packets["src_port"] = [to_int(packet.get("src_port")) for packet in packet_dicts]
+        packets["dst_port"] = [to_int(packet.get("dst_port")) for packet in packet_dicts]
+        return cls.from_packet_array(packets)
+
+    @classmethod
+    def from_packet_array(cls, packets):
+        """PACKET_DTYPE 배열로 흐름 테이블 생성 (flow_id/forward 컬럼을 채움)"""
+        packets = np.sort(packets, order="ts_ns", kind="stable")
+
+        # 방향에 무관한 정규화 키: (IP, 포트)가 작은 쪽을 a로
+        src_end = (packets["src_ip"].astype(np.uint64) << 16) | packets["src_port"]
+        dst_end = (packets["dst_ip"].astype(np.uint64) << 16) | packets["dst_port"]
+        swapped = src_end > dst_end
+        keys = np.empty(len(packets), dtype=[("protocol", np.uint8), ("a", np.uint64), ("b", np.uint64)])
+        keys["protocol"] = packets["protocol"]
+        keys["a"] = np.where(swapped, dst_end, src_end)
+        keys["b"] = np.where(swapped, src_end, dst_end)
+
+        _, first_index, flow_ids = np.unique(keys, return_index=True, return_inverse=True)
+        flow_ids = flow_ids.reshape(-1)
+
+        # 흐름 ID를 최초 등장 순서로 재부여
+        order = np.argsort(first_index, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        flow_ids = rank[flow_ids]
+        first_index = first_index[order]
+
+        packets["flow_id"] = flow_ids
+        packets["forward"] = swapped == swapped[first_index][flow_ids]
+
+        flow_count = len(first_index)
+        flows = np.zeros(flow_count, dtype=FLOW_DTYPE)
+        for field in ("protocol", "src_ip", "dst_ip", "src_port", "dst_port"):
+            flows[field] = packets[field][first_index]
+
+        lengths = packets["length"].astype(np.int64)
+        forward = packets["forward"]
+        flows["packets"] = np.bincount(flow_ids, minlength=flow_count)
+        flows["bytes"] = np.bincount(flow_ids, weights=lengths, minlength=flow_count)
+        flows["fwd_packets"] = np.bincount(flow_ids[forward], minlength=flow_count)
+        flows["fwd_bytes"] = np.bincount(flow_ids[forward], weights=lengths[forward], minlength=flow_count)
+        flows["rev_packets"] = flows["packets"] - flows["fwd_packets"]
+        flows["rev_bytes"] = flows["bytes"] - flows["fwd_bytes"]
+        flows["direction"] = np.where(flows["rev_packets"] > 0, DIRECTION_BIDIRECTIONAL, DIRECTION_ONEWAY)
+
+        if len(packets):
+            # 흐름별 시각순 정렬 후 그룹 경계로 최초/최종 시각과 도착 간격 계산
+            by_flow = np.lexsort((packets["ts_ns"], flow_ids))
+            times = packets["ts_ns"][by_flow]
+            starts = np.concatenate(([0], np.cumsum(flows["packets"])[:-1]))
+            ends = starts + flows["packets"] - 1
+            flows["first_seen_ns"] = times[starts]
+            flows["last_seen_ns"] = times[ends]
+
+            gaps = np.diff(times) / 1e6
+            gap_flows = flow_ids[by_flow][1:]
+            same_flow = gap_flows == flow_ids[by_flow][:-1]
+            gaps, gap_flows = gaps[same_flow], gap_flows[same_flow]
+            gap_order = np.lexsort((gaps, gap_flows))
+            sorted_gaps = gaps[gap_order]
+            gap_sizes = flows["packets"] - 1
+            gap_starts = np.concatenate(([0], np.cumsum(gap_sizes)[:-1]))
+            flows["iat_p50_ms"] = group_percentile(sorted_gaps, gap_starts, gap_sizes, 50)
+            flows["iat_p99_ms"] = group_percentile(sorted_gaps, gap_starts, gap_sizes, 99)
+
+        return cls(packets, flows)
+
+    def flows_per_second(self, port=2001):
+        """
+        초 단위로 대상 포트에 도달한 고유 흐름 수
+
+        Returns:
+            (초 시작 epoch 나노초 배열, 고유 흐름 수 배열)
+        """
+        hits = self.packets[self.packets["dst_port"] == port]
+        if len(hits) == 0:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+
+        seconds = hits["ts_ns"] // 1_000_000_000
+        first_second = seconds.min()
+        counts = distinct_flow_counts(seconds - first_second, hits["flow_id"])
+        return (np.arange(len(counts)) + first_second) * 1_000_000_000, counts
+
+    def top_flows(self, count=10, by="bytes"):
+        """상위 흐름 (기본: 바이트 수 기준)"""
+        order = np.argsort(self.flows[by], kind="stable")[::-1]
+        return self.flows[order[:count]]
+
+    def describe_flow(self, flow):
+        """흐름 한 줄 요약"""
+        protocol = PROTOCOL_NAMES.get(int(flow["protocol"]), str(flow["protocol"]))
+        duration = (flow["last_seen_ns"] - flow["first_seen_ns"]) / 1e9
+        return (f"{protocol:<5} {int_to_ip(flow['src_ip'])}:{flow['src_port']} -> "
+                f"{int_to_ip(flow['dst_ip'])}:{flow['dst_port']}  "
+                f"패킷 {flow['packets']} ({flow['fwd_packets']}/{flow['rev_packets']}), "
+                f"바이트 {flow['bytes']}, 지속 {duration:.3f}초, "
+                f"도착 간격 p50 {flow['iat_p50_ms']:.3f}ms p99 {flow['iat_p99_ms']:.3f}ms, "
+                f"{DIRECTION_NAMES[int(flow['direction'])]}")
+
+    def save(self, filename):
+        """패킷/흐름 테이블을 컬럼 형식(.npz)으로 저장"""
+        columns = {f"packet_{name}": self.packets[name] for name in PACKET_DTYPE.names}
+        columns.update({f"flow_{name}": self.flows[name] for name in FLOW_DTYPE.names})
+        np.savez_compressed(filename, **columns)
+        return filename
+
+    @classmethod
+    def load(cls, filename):
+        """저장된 컬럼 파일에서 흐름 테이블 로드"""
+        with np.load(filename) as columns:
+            packet_count = len(columns["packet_ts_ns"])
+            flow_count = len(columns["flow_packets"])
+            packets = np.zeros(packet_count, dtype=PACKET_DTYPE)
+            flows = np.zeros(flow_count, dtype=FLOW_DTYPE)
+            for name in PACKET_DTYPE.names:
+                packets[name] = columns[f"packet_{name}"]
+            for name in FLOW_DTYPE.names:
+                flows[name] = columns[f"flow_{name}"]
+        return cls(packets, flows)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="캡처 트래픽 흐름 통계")
+    parser.add_argument("--analysis", help="ue_packet_analysis_*.json 분석 결과 파일")
+    parser.add_argument("--table", help="저장된 흐름 테이블 (.npz)")
+    parser.add_argument("--output", help="흐름 테이블 저장 파일 (.npz)")
+    parser.add_argument("--port", type=int, default=2001, help="초당 고유 흐름 수를 셀 대상 포트")
+    parser.add_argument("--top", type=int, default=10, help="출력할 상위 흐름 수")
+
+    args = parser.parse_args()
+
+    if args.table:
+        table = FlowTable.load(args.table)
+    elif args.analysis:
+        with open(args.analysis, 'r', encoding='utf-8') as f:
+            analysis_result = json.load(f)
+        table = FlowTable.from_packets(analysis_result.get("all_packets", []))
+    else:
+        parser.error("--analysis 또는 --table이 필요합니다.")
+
+    print(f"패킷 수: {len(table.packets)}, 흐름 수: {len(table.flows)}")
+
+    print(f"\n=== 상위 {args.top}개 흐름 (바이트 기준) ===")
+    for flow in table.top_flows(args.top):
+        print(table.describe_flow(flow))
+
+    seconds, counts = table.flows_per_second(args.port)
+    if len(counts):
+        print(f"\n=== 포트 {args.port} 초당 고유 흐름 수 ===")
+        print(f"최대 {counts.max()}개/초, 평균 {counts.mean():.1f}개/초 ({len(counts)}초 구간)")
+
+    if args.output:
+        table.save(args.output)
+        print(f"\n흐름 테이블 저장: {args.output}")
+
+if __name__ == "__main__":
+    main()
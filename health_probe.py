@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+대상 응답성 헬스 프로브
+낮은 주기로 대상에 정상 클라이언트처럼 접속하여 연결(connect) 지연과 왕복(round-trip) 지연을
+측정하고, 시간 창(window)별 HDR 방식 로그 버킷 히스토그램에 기록합니다.
+기록 경로는 미리 할당된 버킷 배열의 카운터만 증가시키므로 프로브 수가 많아도 잡음을 더하지 않습니다.
+"""
+
+import json
+import socket
+import threading
+import time
+from datetime import datetime
+
+class LatencyHistogram:
+    # SUB_BUCKET_COUNT(2^SUB_BUCKET_BITS = 32) 미만은 1us 단위 선형 버킷,
+    # 이후 옥타브(2의 거듭제곱 구간)마다 HALF_COUNT(16)개 버킷 (버킷 폭 기준 상대 오차 약 3~6%)
+    SUB_BUCKET_BITS = 5
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    HALF_COUNT = SUB_BUCKET_COUNT // 2
+
+    def __init__(self, max_value_us=60_000_000):
+        """
+        로그 버킷 지연 히스토그램 (마이크로초 단위)
+
+        Args:
+            max_value_us: 기록 가능한 최대값 (초과 값은 마지막 버킷에 기록)
+        """
+        self.max_value_us = max_value_us
+        max_exponent = max_value_us.bit_length() - 1
+        self.bucket_count = self.SUB_BUCKET_COUNT + (max_exponent - self.SUB_BUCKET_BITS + 1) * self.HALF_COUNT
+        self.counts = [0] * self.bucket_count
+        self.total = 0
+        self.max_recorded = 0
+
+    def bucket_index(self, value_us):
+        """값 -> 버킷 인덱스 (SUB_BUCKET_COUNT 미만은 선형, 이후 옥타브당 HALF_COUNT개)"""
+        if value_us < self.SUB_BUCKET_COUNT:
+            return value_us if value_us > 0 else 0
+        exponent = value_us.bit_length() - 1
+        top = value_us >> (exponent - self.SUB_BUCKET_BITS + 1)
+        index = self.SUB_BUCKET_COUNT + (exponent - self.SUB_BUCKET_BITS) * self.HALF_COUNT + (top - self.HALF_COUNT)
+        return index if index < self.bucket_count else self.bucket_count - 1
+
+    def bucket_value(self, index):
+        """버킷 인덱스 -> 대표값 (버킷 중간값, 마이크로초)"""
+        if index < self.SUB_BUCKET_COUNT:
+            return index
+        offset = index - self.SUB_BUCKET_COUNT
+        exponent = offset // self.HALF_COUNT + self.SUB_BUCKET_BITS
+        top = offset % self.HALF_COUNT + self.HALF_COUNT
+        shift = exponent - self.SUB_BUCKET_BITS + 1
+        return ((top << shift) + (((top + 1) << shift) - 1)) // 2
+
+    def record(self, value_us):
+        """지연 기록 (새 객체를 할당하지 않는 카운터 증가만 수행)"""
+        self.counts[self.bucket_index(value_us)] += 1
+        self.total += 1
+        if value_us > self.max_recorded:
+            self.max_recorded = value_us
+
+    def value_at_percentile(self, percentile):
+        """백분위 지연 (마이크로초, 기록이 없으면 None)"""
+        if self.total == 0:
+            return None
+        target = max(1, int(self.total * percentile / 100 + 0.5))
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(self.bucket_value(index), self.max_recorded)
+        return self.max_recorded
+
+    def add(self, other):
+        """다른 히스토그램 합산"""
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.total += other.total
+        self.max_recorded = max(self.max_recorded, other.max_recorded)
+
+    def reset(self):
+        """버킷 배열을 재할당하지 않고 초기화"""
+        for index in range(self.bucket_count):
+            self.counts[index] = 0
+        self.total = 0
+        self.max_recorded = 0
+
+    def summary(self):
+        """p50/p99/p999 요약 (밀리초)"""
+        result = {"count": self.total}
+        for name, percentile in (("p50", 50), ("p99", 99), ("p999", 99.9)):
+            value = self.value_at_percentile(percentile)
+            result[f"{name}_ms"] = value / 1000 if value is not None else None
+        result["max_ms"] = self.max_recorded / 1000 if self.total else None
+        return result
+
+class HealthProbe:
+    def __init__(self, target_ip="127.0.0.1", target_port=2001, probe_interval=1.0,
+                 window_seconds=10.0, timeout=2.0, probe_payload=b"\x00"):
+        """
+        대상 응답성 헬스 프로브
+
+        Args:
+            target_ip: 대상 IP
+            target_port: 대상 포트
+            probe_interval: 프로브 간격 (초)
+            window_seconds: 히스토그램 시간 창 크기 (초)
+            timeout: 연결/응답 대기 시간 (초)
+            probe_payload: 왕복 지연 측정용 전송 데이터
+        """
+        self.target_ip = target_ip
+        self.target_port = target_port
+        self.probe_interval = probe_interval
+        self.window_seconds = window_seconds
+        self.timeout = timeout
+        self.probe_payload = probe_payload
+        self.running = False
+
+        # 현재 창 히스토그램 (창이 끝나면 전체 누적에 합산 후 재사용)
+        self.connect_histogram = LatencyHistogram()
+        self.rtt_histogram = LatencyHistogram()
+        self.total_connect_histogram = LatencyHistogram()
+        self.total_rtt_histogram = LatencyHistogram()
+
+        self.window_start = None
+        self.window_errors = {"connect": 0, "rtt": 0}
+        self.windows = []
+
+    def probe_once(self):
+        """단일 프로브: 연결 지연과 왕복 지연 측정"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            start = time.perf_counter_ns()
+            try:
+                sock.connect((self.target_ip, self.target_port))
+            except OSError:
+                self.window_errors["connect"] += 1
+                return
+            connected = time.perf_counter_ns()
+            self.connect_histogram.record((connected - start) // 1000)
+
+            try:
+                sock.sendall(self.probe_payload)
+                if not sock.recv(1):
+                    raise ConnectionError("응답 없이 연결 종료")
+            except OSError:
+                self.window_errors["rtt"] += 1
+                return
+            self.rtt_histogram.record((time.perf_counter_ns() - connected) // 1000)
+        finally:
+            sock.close()
+
+    def close_window(self, now):
+        """현재 창 요약 기록 후 히스토그램 재사용"""
+        self.windows.append({
+            "window_start": self.window_start.isoformat(),
+            "window_end": now.isoformat(),
+            "connect": self.connect_histogram.summary(),
+            "rtt": self.rtt_histogram.summary(),
+            "connect_errors": self.window_errors["connect"],
+            "rtt_errors": self.window_errors["rtt"]
+        })
+        self.total_connect_histogram.add(self.connect_histogram)
+        self.total_rtt_histogram.add(self.rtt_histogram)
+        self.connect_histogram.reset()
+        self.rtt_histogram.reset()
+        self.window_errors["connect"] = 0
+        self.window_errors["rtt"] = 0
+        self.window_start = now
+
+    def probe_loop(self):
+        """프로브 루프"""
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 헬스 프로브 시작 ({self.target_ip}:{self.target_port})")
+        self.window_start = datetime.now()
+        next_probe = time.monotonic()
+
+        while self.running:
+            try:
+                self.probe_once()
+            except Exception as e:
+                print(f"헬스 프로브 오류: {e}")
+
+            now = datetime.now()
+            if (now - self.window_start).total_seconds() >= self.window_seconds:
+                self.close_window(now)
+
+            next_probe += self.probe_interval
+            sleep_time = next_probe - time.monotonic()
+            if sleep_time > 0:
+                time.sleep(sleep_time)
+
+        # 마지막 미완료 창 기록
+        if self.connect_histogram.total or any(self.window_errors.values()):
+            self.close_window(datetime.now())
+
+    def start(self):
+        """프로브 시작"""
+        self.running = True
+        probe_thread = threading.Thread(target=self.probe_loop)
+        probe_thread.daemon = True
+        probe_thread.start()
+        return probe_thread
+
+    def stop(self):
+        """프로브 중지"""
+        self.running = False
+
+    def overall_summary(self):
+        """전체 기간 지연 요약"""
+        return {
+            "connect": self.total_connect_histogram.summary(),
+            "rtt": self.total_rtt_histogram.summary(),
+            "connect_errors": sum(w["connect_errors"] for w in self.windows),
+            "rtt_errors": sum(w["rtt_errors"] for w in self.windows)
+        }
+
+    def save_data(self, filename=None):
+        """프로브 결과 저장"""
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"health_probe_data_{timestamp}.json"
+
+        data = {
+            "probe_info": {
+                "target_ip": self.target_ip,
+                "target_port": self.target_port,
+                "probe_interval": self.probe_interval,
+                "window_seconds": self.window_seconds,
+                "timeout": self.timeout
+            },
+            "overall": self.overall_summary(),
+            "windows": self.windows
+        }
+
+        try:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            print(f"헬스 프로브 데이터 저장: {filename}")
+            return filename
+        except Exception as e:
+            print(f"데이터 저장 오류: {e}")
+            return None
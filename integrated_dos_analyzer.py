@@ -13,22 +13,206 @@ import signal
 import sys
 from datetime import datetime
 from memory_analysis import MemoryMonitor
-import matplotlib.pyplot as plt
+from health_probe import HealthProbe
+from report_pipeline import ReportPipeline, PipelineTimeout
+from functools import partial
+import matplotlib
+from matplotlib.figure import Figure
 import numpy as np
 import pandas as pd
 
+def render_comprehensive_chart(frame, crash_time, plot_filename):
+    """
+    종합 분석 차트 렌더링 (후처리 파이프라인의 프로세스 작업)
+    pyplot 전역 상태와 plt.show()를 쓰지 않는 Figure API로 그리므로 작업자 프로세스에서 실행할 수 있습니다.
+    
+    Args:
+        frame: build_analysis_frame 결과
+        crash_time: 크래시 감지 시각 (없으면 None)
+        plot_filename: 저장 파일명
+    
+    Returns:
+        저장 파일명 (데이터가 없으면 None)
+    """
+    df = frame["monitor"]
+    if df is None:
+        print("시각화할 데이터가 없습니다.")
+        return None
+    
+    # 한글 폰트 설정 (Ubuntu 환경)
+    matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    
+    # 크래시 시점 계산
+    crash_minutes = None
+    if crash_time:
+        crash_minutes = (crash_time - df['timestamp'].iloc[0]).total_seconds() / 60
+    
+    # 그래프 생성
+    fig = Figure(figsize=(16, 12))
+    axes = fig.subplots(2, 2)
+    fig.suptitle('DoS Attack Analysis: Memory Usage to Crash', fontsize=18, fontweight='bold')
+    
+    # 1. 메모리 사용률 (메인 차트)
+    axes[0, 0].plot(df['minutes'], df['memory_usage'], 'b-', linewidth=3, label='Memory Usage')
+    axes[0, 0].axhline(y=95, color='red', linestyle='--', linewidth=2, alpha=0.8, label='Crash Threshold (95%)')
+    axes[0, 0].axhline(y=80, color='orange', linestyle='--', linewidth=2, alpha=0.7, label='Warning Threshold (80%)')
+    axes[0, 0].axhline(y=60, color='yellow', linestyle='--', linewidth=1, alpha=0.6, label='Caution Threshold (60%)')
+    
+    if crash_minutes:
+        axes[0, 0].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=3, alpha=0.9, 
+                          label=f'Crash Detected ({crash_minutes:.1f}min)')
+    
+    axes[0, 0].set_title('Memory Usage Change', fontsize=14, fontweight='bold')
+    axes[0, 0].set_xlabel('Time (minutes)', fontsize=12)
+    axes[0, 0].set_ylabel('Memory Usage (%)', fontsize=12)
+    axes[0, 0].legend(fontsize=10)
+    axes[0, 0].grid(True, alpha=0.3)
+    axes[0, 0].set_ylim(0, 100)
+    
+    # 2. 네트워크 연결 수
+    axes[0, 1].plot(df['minutes'], df['connections'], 'g-', linewidth=2, label='Network Connections')
+    if crash_minutes:
+        axes[0, 1].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
+    axes[0, 1].set_title('Network Connections Change', fontsize=14, fontweight='bold')
+    axes[0, 1].set_xlabel('Time (minutes)', fontsize=12)
+    axes[0, 1].set_ylabel('Connections', fontsize=12)
+    axes[0, 1].legend(fontsize=10)
+    axes[0, 1].grid(True, alpha=0.3)
+    
+    # 3. CPU 사용률
+    axes[1, 0].plot(df['minutes'], df['cpu_usage'], 'purple', linewidth=2, label='CPU Usage')
+    if crash_minutes:
+        axes[1, 0].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
+    axes[1, 0].set_title('CPU Usage Change', fontsize=14, fontweight='bold')
+    axes[1, 0].set_xlabel('Time (minutes)', fontsize=12)
+    axes[1, 0].set_ylabel('CPU Usage (%)', fontsize=12)
+    axes[1, 0].legend(fontsize=10)
+    axes[1, 0].grid(True, alpha=0.3)
+    axes[1, 0].set_ylim(0, 100)
+    
+    # 4. 프로세스 수
+    axes[1, 1].plot(df['minutes'], df['process_count'], 'orange', linewidth=2, label='Process Count')
+    if crash_minutes:
+        axes[1, 1].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
+    axes[1, 1].set_title('Process Count Change', fontsize=14, fontweight='bold')
+    axes[1, 1].set_xlabel('Time (minutes)', fontsize=12)
+    axes[1, 1].set_ylabel('Process Count', fontsize=12)
+    axes[1, 1].legend(fontsize=10)
+    axes[1, 1].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    fig.savefig(plot_filename, dpi=300, bbox_inches='tight')
+    return plot_filename
+
+def render_latency_chart(frame, crash_time, probe_window, plot_filename):
+    """
+    대상 응답 지연 백분위 차트 렌더링 (후처리 파이프라인의 프로세스 작업)
+    
+    Args:
+        frame: build_analysis_frame 결과
+        crash_time: 크래시 감지 시각 (없으면 None)
+        probe_window: 프로브 시간 창 크기 (초)
+        plot_filename: 저장 파일명
+    
+    Returns:
+        저장 파일명 (데이터가 없으면 None)
+    """
+    windows = frame["latency_windows"]
+    if not windows:
+        print("시각화할 지연 데이터가 없습니다.")
+        return None
+    
+    matplotlib.rcParams['font.family'] = 'DejaVu Sans'
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    
+    start_time = datetime.fromisoformat(windows[0]["window_start"])
+    minutes = [(datetime.fromisoformat(w["window_end"]) - start_time).total_seconds() / 60 for w in windows]
+    
+    crash_minutes = None
+    if crash_time:
+        crash_minutes = (crash_time - start_time).total_seconds() / 60
+    
+    fig = Figure(figsize=(20, 6))
+    axes = fig.subplots(1, 3)
+    fig.suptitle('Target Responsiveness Under Attack', fontsize=18, fontweight='bold')
+    
+    for ax, key, title in ((axes[0], "connect", "Connect Latency"), (axes[1], "rtt", "Round-trip Latency")):
+        for percentile, style in (("p50", 'g-'), ("p99", 'orange'), ("p999", 'r-')):
+            values = [w[key][f"{percentile}_ms"] for w in windows]
+            values = [v if v is not None else np.nan for v in values]
+            ax.plot(minutes, values, style, linewidth=2, label=percentile)
+        if crash_minutes:
+            ax.axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
+        ax.set_title(title, fontsize=14, fontweight='bold')
+        ax.set_xlabel('Time (minutes)', fontsize=12)
+        ax.set_ylabel('Latency (ms)', fontsize=12)
+        ax.set_yscale('log')
+        ax.legend(fontsize=10)
+        ax.grid(True, alpha=0.3)
+    
+    # 프로브 실패 수
+    axes[2].bar(minutes, [w["connect_errors"] + w["rtt_errors"] for w in windows],
+                width=probe_window / 60 * 0.8, color='red', alpha=0.7, label='Failed Probes')
+    axes[2].set_title('Probe Failures per Window', fontsize=14, fontweight='bold')
+    axes[2].set_xlabel('Time (minutes)', fontsize=12)
+    axes[2].set_ylabel('Failures', fontsize=12)
+    axes[2].legend(fontsize=10)
+    axes[2].grid(True, alpha=0.3)
+    
+    fig.tight_layout()
+    fig.savefig(plot_filename, dpi=300, bbox_inches='tight')
+    return plot_filename
+
 class IntegratedDoSAnalyzer:
-    def __init__(self):
-        self.monitor = MemoryMonitor(monitoring_interval=0.5)  # 더 자주 모니터링
+    def __init__(self, target_pid=None, cgroup_path=None, adaptive=False, min_interval=0.1, max_interval=5.0,
+                 memory_breakdown=False, breakdown_interval=5.0,
+                 health_probe=False, probe_interval=1.0, probe_window=10.0, archive=False,
+                 report_timeout=120.0, report_workers=2, attach_memory_max_mb=None, cgroup_parent=None):
+        """
+        통합 분석기
+        
+        Args:
+            target_pid: 대상 프로세스 PID (지정 시 cgroup v2 기준으로 측정)
+            cgroup_path: 측정할 cgroup v2 경로
+            adaptive: 적응형 샘플링 사용 여부
+            min_interval: 적응형 샘플링 최소 간격 (초)
+            max_interval: 적응형 샘플링 최대 간격 (초)
+            memory_breakdown: 대상 프로세스 메모리 구성 수집 여부 (target_pid 필요)
+            breakdown_interval: 메모리 구성 최소 수집 간격 (초)
+            health_probe: 대상 응답성(연결/왕복 지연) 프로브 사용 여부
+            probe_interval: 프로브 간격 (초)
+            probe_window: 지연 히스토그램 시간 창 크기 (초)
+            archive: 모니터링 데이터를 JSON과 함께 압축 아카이브(.ltearc)로도 저장
+            report_timeout: 분석 후처리(저장/차트/보고서) 파이프라인 전체 제한 시간 (초)
+            report_workers: 차트 렌더링 프로세스 수
+            attach_memory_max_mb: 지정 시 target_pid를 memory.max(MB)가 설정된 새 cgroup으로 옮겨 측정
+            cgroup_parent: attach_memory_max_mb 사용 시 하위 cgroup을 만들 위임된 부모 cgroup 경로
+        """
+        self.monitor = MemoryMonitor(monitoring_interval=0.5,  # 더 자주 모니터링
+                                     target_pid=target_pid, cgroup_path=cgroup_path,
+                                     attach_memory_max_mb=attach_memory_max_mb, cgroup_parent=cgroup_parent,
+                                     adaptive=adaptive, min_interval=min_interval, max_interval=max_interval,
+                                     memory_breakdown=memory_breakdown, breakdown_interval=breakdown_interval)
         self.flooding_process = None
         self.running = False
+        
+        # 헬스 프로브 (대상 주소는 run_analysis에서 결정)
+        self.health_probe_enabled = health_probe
+        self.probe_interval = probe_interval
+        self.probe_window = probe_window
+        self.health_probe = None
+        self.archive = archive
+        self.report_timeout = report_timeout
+        self.report_workers = report_workers
         self.attack_stats = {
             "start_time": None,
             "end_time": None,
             "messages_sent": 0,
             "connections_created": 0,
             "crash_detected": False,
-            "crash_time": None
+            "crash_time": None,
+            "crash_reason": None
         }
         
     def start_flooding_attack(self, messages_file, target_ip="127.0.0.1", target_port=2001, 
@@ -102,8 +286,8 @@ class IntegratedDoSAnalyzer:
                 if self.flooding_process.poll() is not None:
                     break
                 
-                # 시스템 리소스 확인
-                system_info = self.monitor.get_system_info()
+                # 시스템 리소스 확인 (모니터링 스레드의 마지막 샘플, 별도 샘플링 시 CPU 측정 구간이 섞임)
+                system_info = self.monitor.latest_system_info()
                 if system_info:
                     current_connections = system_info["connections"]
                     
@@ -121,6 +305,7 @@ class IntegratedDoSAnalyzer:
                             if connection_drop_count >= 3:  # 3회 연속 감소 확인
                                 self.attack_stats["crash_detected"] = True
                                 self.attack_stats["crash_time"] = datetime.now()
+                                self.attack_stats["crash_reason"] = "connection_drop"
                                 crash_duration = (self.attack_stats["crash_time"] - self.attack_stats["start_time"]).total_seconds() / 60
                                 
                                 print(f"\n🚨 SERVER CRASH DETECTED! 🚨")
@@ -138,10 +323,31 @@ class IntegratedDoSAnalyzer:
                         else:
                             connection_drop_count = 0  # 리셋
                     
-                    # 기존 메모리 크래시 감지
-                    if system_info["memory_percent"] >= 95 and not self.attack_stats["crash_detected"]:
+                    # 실제 OOM kill 감지 (cgroup 백엔드)
+                    if system_info["oom_kills"] > 0 and not self.attack_stats["crash_detected"]:
+                        self.attack_stats["crash_detected"] = True
+                        self.attack_stats["crash_time"] = datetime.now()
+                        self.attack_stats["crash_reason"] = "oom_kill"
+                        crash_duration = (self.attack_stats["crash_time"] - self.attack_stats["start_time"]).total_seconds() / 60
+                        
+                        print(f"\n🚨 OOM KILL DETECTED! 🚨")
+                        print(f"시간: {self.attack_stats['crash_time'].strftime('%H:%M:%S')}")
+                        print(f"크래시까지 소요 시간: {crash_duration:.1f}분")
+                        print(f"OOM kill 횟수: {system_info['oom_kills']}")
+                        print(f"대상 메모리: {system_info['memory_mb']:.1f}MB ({system_info['memory_percent']:.1f}%)")
+                        print("=" * 50)
+                        
+                        # 공격 중지
+                        self.stop_attack()
+                        break
+                    
+                    # 기존 메모리 크래시 감지 (호스트 기준일 때만, cgroup 백엔드는 memory.max 대비 비율이므로
+                    # MemoryMonitor와 같이 OOM kill 증가분만으로 판단)
+                    if (not self.monitor.cgroup and system_info["memory_percent"] >= 95
+                            and not self.attack_stats["crash_detected"]):
                         self.attack_stats["crash_detected"] = True
                         self.attack_stats["crash_time"] = datetime.now()
+                        self.attack_stats["crash_reason"] = "memory_threshold"
                         crash_duration = (self.attack_stats["crash_time"] - self.attack_stats["start_time"]).total_seconds() / 60
                         
                         print(f"\n🚨 MEMORY CRASH DETECTED! 🚨")
@@ -202,10 +408,18 @@ class IntegratedDoSAnalyzer:
         default_params.update(attack_params)
         
         try:
-            # 메모리 모니터링 시작
+            # 메모리 모니터링 시작 (저장소는 공격 전체 구간을 담도록 설정)
+            self.monitor.resize_buffers(self.monitor.data_points_for(default_params["duration"] + 60))
             monitor_thread = self.monitor.start_monitoring()
             self.running = True
             
+            # 헬스 프로브 시작
+            if self.health_probe_enabled:
+                self.health_probe = HealthProbe(default_params["target_ip"], default_params["target_port"],
+                                                probe_interval=self.probe_interval,
+                                                window_seconds=self.probe_window)
+                probe_thread = self.health_probe.start()
+            
             # Flooding 공격 시작
             if not self.start_flooding_attack(messages_file, **default_params):
                 return False
@@ -232,124 +446,154 @@ class IntegratedDoSAnalyzer:
             # 모니터링 중지
             self.monitor.stop_monitoring()
             monitor_thread.join(timeout=5)
+            if self.health_probe:
+                self.health_probe.stop()
+                probe_thread.join(timeout=self.health_probe.timeout * 2 + self.probe_interval)
             
             # 결과 분석 및 저장
             self.generate_comprehensive_report()
     
     def generate_comprehensive_report(self):
-        """종합 분석 보고서 생성"""
+        """
+        종합 분석 보고서 생성
+        데이터 저장 -> 분석 프레임 구성 -> 차트/보고서(병렬) 순서의 후처리 파이프라인으로 실행하며,
+        파이프라인 전체에 report_timeout 제한 시간을 적용합니다.
+        """
         print("\n=== 종합 분석 보고서 생성 ===")
         
-        # 데이터 저장
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        data_file = self.monitor.save_data(f"integrated_dos_analysis_{timestamp}.json")
+        crash_time = self.attack_stats["crash_time"]
+        pipeline = ReportPipeline(timeout=self.report_timeout, process_workers=self.report_workers)
+        
+        # 데이터 저장 (서로 독립)
+        # 분석기 자체 크래시 판정(연결 수 급감 등)도 함께 저장하여 evaluate_detection에서 채점
+        attack_stats = self.attack_stats_summary()
+        pipeline.add_task("save_data", partial(self.monitor.save_data, f"integrated_dos_analysis_{timestamp}.json",
+                                               extra_stats=attack_stats))
+        if self.archive:
+            pipeline.add_task("save_archive", partial(self.monitor.save_data,
+                                                      f"integrated_dos_analysis_{timestamp}.ltearc", archive=True,
+                                                      extra_stats=attack_stats))
+        if self.health_probe:
+            pipeline.add_task("save_health_probe",
+                              partial(self.health_probe.save_data, f"integrated_health_probe_{timestamp}.json"))
+        
+        # 분석 프레임 구성 후 차트 렌더링(프로세스)과 보고서 작성을 병렬 실행
+        pipeline.add_task("build_frame", lambda data_file: self.build_analysis_frame(), depends_on=["save_data"])
+        pipeline.add_task("comprehensive_chart",
+                          partial(render_comprehensive_chart, crash_time=crash_time,
+                                  plot_filename=f"comprehensive_dos_analysis_{timestamp}.png"),
+                          depends_on=["build_frame"], process=True)
+        if self.health_probe:
+            pipeline.add_task("latency_chart",
+                              partial(render_latency_chart, crash_time=crash_time, probe_window=self.probe_window,
+                                      plot_filename=f"latency_percentiles_{timestamp}.png"),
+                              depends_on=["build_frame"], process=True)
+        pipeline.add_task("report", partial(self.write_report, timestamp), depends_on=["build_frame"])
         
-        # 시각화 생성
-        self.create_comprehensive_visualization()
+        try:
+            results = pipeline.run()
+        except PipelineTimeout as e:
+            print(f"후처리 파이프라인 중단: {e}")
+            return None
+        
+        for name, label in (("comprehensive_chart", "종합 분석 그래프 저장"), ("latency_chart", "응답 지연 그래프 저장")):
+            if results.get(name):
+                print(f"{label}: {results[name]}")
+        
+        report = results.get("report")
+        if report:
+            print("\n" + "="*60)
+            print(report)
+            print("="*60)
+        return results
+    
+    def attack_stats_summary(self):
+        """저장용 공격 통계 (attack_ 접두어, 시각은 ISO 형식)"""
+        return {f"attack_{key}": value.isoformat() if isinstance(value, datetime) else value
+                for key, value in self.attack_stats.items()}
+    
+    def build_analysis_frame(self):
+        """
+        차트 렌더링 프로세스에 넘길 분석 프레임 구성 (pickle 가능한 값만 포함)
         
-        # 상세 보고서 생성
+        Returns:
+            {"monitor": 모니터링 DataFrame, "latency_windows": 헬스 프로브 시간 창 목록}
+        """
+        df = None
+        if self.monitor.timestamps:
+            df = pd.DataFrame({
+                'timestamp': list(self.monitor.timestamps),
+                'memory_usage': list(self.monitor.memory_usage),
+                'cpu_usage': list(self.monitor.cpu_usage),
+                'connections': list(self.monitor.connections),
+                'process_count': list(self.monitor.process_count)
+            })
+            # 시간을 분 단위로 변환
+            df['minutes'] = (df['timestamp'] - df['timestamp'].iloc[0]).dt.total_seconds() / 60
+        
+        return {
+            "monitor": df,
+            "latency_windows": list(self.health_probe.windows) if self.health_probe else []
+        }
+    
+    def write_report(self, timestamp, frame=None):
+        """상세 보고서 생성 및 파일 저장 (frame은 파이프라인 의존 순서용, 보고서는 모니터 데이터를 직접 사용)"""
         report = self.create_detailed_report()
         
-        # 보고서 파일 저장
         report_filename = f"comprehensive_dos_report_{timestamp}.txt"
         with open(report_filename, 'w', encoding='utf-8') as f:
             f.write(report)
         
         print(f"종합 분석 보고서 저장: {report_filename}")
-        print("\n" + "="*60)
-        print(report)
-        print("="*60)
+        return report
     
     def create_comprehensive_visualization(self):
-        """종합 시각화 생성"""
-        if not self.monitor.timestamps:
-            print("시각화할 데이터가 없습니다.")
-            return
-        
-        # 한글 폰트 설정 (Ubuntu 환경)
-        plt.rcParams['font.family'] = 'DejaVu Sans'
-        plt.rcParams['axes.unicode_minus'] = False
-        
-        # 데이터 준비
-        df = pd.DataFrame({
-            'timestamp': list(self.monitor.timestamps),
-            'memory_usage': list(self.monitor.memory_usage),
-            'cpu_usage': list(self.monitor.cpu_usage),
-            'connections': list(self.monitor.connections),
-            'process_count': list(self.monitor.process_count)
-        })
-        
-        # 시간을 분 단위로 변환
-        start_time = df['timestamp'].iloc[0]
-        df['minutes'] = [(t - start_time).total_seconds() / 60 for t in df['timestamp']]
-        
-        # 크래시 시점 계산
-        crash_minutes = None
-        if self.attack_stats["crash_time"]:
-            crash_minutes = (self.attack_stats["crash_time"] - start_time).total_seconds() / 60
-        
-        # 그래프 생성
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-        fig.suptitle('DoS Attack Analysis: Memory Usage to Crash', fontsize=18, fontweight='bold')
-        
-        # 1. 메모리 사용률 (메인 차트)
-        axes[0, 0].plot(df['minutes'], df['memory_usage'], 'b-', linewidth=3, label='Memory Usage')
-        axes[0, 0].axhline(y=95, color='red', linestyle='--', linewidth=2, alpha=0.8, label='Crash Threshold (95%)')
-        axes[0, 0].axhline(y=80, color='orange', linestyle='--', linewidth=2, alpha=0.7, label='Warning Threshold (80%)')
-        axes[0, 0].axhline(y=60, color='yellow', linestyle='--', linewidth=1, alpha=0.6, label='Caution Threshold (60%)')
-        
-        if crash_minutes:
-            axes[0, 0].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=3, alpha=0.9, 
-                              label=f'Crash Detected ({crash_minutes:.1f}min)')
-        
-        axes[0, 0].set_title('Memory Usage Change', fontsize=14, fontweight='bold')
-        axes[0, 0].set_xlabel('Time (minutes)', fontsize=12)
-        axes[0, 0].set_ylabel('Memory Usage (%)', fontsize=12)
-        axes[0, 0].legend(fontsize=10)
-        axes[0, 0].grid(True, alpha=0.3)
-        axes[0, 0].set_ylim(0, 100)
-        
-        # 2. 네트워크 연결 수
-        axes[0, 1].plot(df['minutes'], df['connections'], 'g-', linewidth=2, label='Network Connections')
-        if crash_minutes:
-            axes[0, 1].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
-        axes[0, 1].set_title('Network Connections Change', fontsize=14, fontweight='bold')
-        axes[0, 1].set_xlabel('Time (minutes)', fontsize=12)
-        axes[0, 1].set_ylabel('Connections', fontsize=12)
-        axes[0, 1].legend(fontsize=10)
-        axes[0, 1].grid(True, alpha=0.3)
-        
-        # 3. CPU 사용률
-        axes[1, 0].plot(df['minutes'], df['cpu_usage'], 'purple', linewidth=2, label='CPU Usage')
-        if crash_minutes:
-            axes[1, 0].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
-        axes[1, 0].set_title('CPU Usage Change', fontsize=14, fontweight='bold')
-        axes[1, 0].set_xlabel('Time (minutes)', fontsize=12)
-        axes[1, 0].set_ylabel('CPU Usage (%)', fontsize=12)
-        axes[1, 0].legend(fontsize=10)
-        axes[1, 0].grid(True, alpha=0.3)
-        axes[1, 0].set_ylim(0, 100)
-        
-        # 4. 프로세스 수
-        axes[1, 1].plot(df['minutes'], df['process_count'], 'orange', linewidth=2, label='Process Count')
-        if crash_minutes:
-            axes[1, 1].axvline(x=crash_minutes, color='red', linestyle=':', linewidth=2, alpha=0.8)
-        axes[1, 1].set_title('Process Count Change', fontsize=14, fontweight='bold')
-        axes[1, 1].set_xlabel('Time (minutes)', fontsize=12)
-        axes[1, 1].set_ylabel('Process Count', fontsize=12)
-        axes[1, 1].legend(fontsize=10)
-        axes[1, 1].grid(True, alpha=0.3)
-        
-        plt.tight_layout()
-        
-        # 그래프 저장
+        """종합 시각화 생성 (파이프라인 없이 단독 실행)"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        plot_filename = f"comprehensive_dos_analysis_{timestamp}.png"
-        plt.savefig(plot_filename, dpi=300, bbox_inches='tight')
-        print(f"종합 분석 그래프 저장: {plot_filename}")
-        
-        plt.show()
-        return fig
+        plot_filename = render_comprehensive_chart(self.build_analysis_frame(), self.attack_stats["crash_time"],
+                                                   f"comprehensive_dos_analysis_{timestamp}.png")
+        if plot_filename:
+            print(f"종합 분석 그래프 저장: {plot_filename}")
+        return plot_filename
+    
+    def create_latency_visualization(self):
+        """대상 응답 지연 백분위 시각화 (파이프라인 없이 단독 실행)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        plot_filename = render_latency_chart(self.build_analysis_frame(), self.attack_stats["crash_time"],
+                                             self.probe_window, f"latency_percentiles_{timestamp}.png")
+        if plot_filename:
+            print(f"응답 지연 그래프 저장: {plot_filename}")
+        return plot_filename
+    
+    def create_latency_report(self):
+        """응답 지연 보고서 섹션 생성"""
+        if not self.health_probe or not self.health_probe.windows:
+            return ""
+        
+        overall = self.health_probe.overall_summary()
+        
+        def fmt(value):
+            return f"{value:.2f}ms" if value is not None else "N/A"
+        
+        lines = [
+            "",
+            "⏱️  대상 응답 지연 (헬스 프로브):",
+            "┌─────────────────────────────────────────────────────────────────────────────┐",
+            f"│ 연결 지연 p50/p99/p999: {fmt(overall['connect']['p50_ms'])} / {fmt(overall['connect']['p99_ms'])} / {fmt(overall['connect']['p999_ms'])}",
+            f"│ 왕복 지연 p50/p99/p999: {fmt(overall['rtt']['p50_ms'])} / {fmt(overall['rtt']['p99_ms'])} / {fmt(overall['rtt']['p999_ms'])}",
+            f"│ 성공 프로브: {overall['rtt']['count']}개 / 연결 실패: {overall['connect_errors']}개 / 응답 실패: {overall['rtt_errors']}개",
+            "├─────────────────────────────────────────────────────────────────────────────┤",
+            "│ 시간 창별 왕복 지연 (p50 / p99 / p999, 실패 수):"
+        ]
+        for window in self.health_probe.windows:
+            window_end = datetime.fromisoformat(window["window_end"]).strftime('%H:%M:%S')
+            rtt = window["rtt"]
+            failures = window["connect_errors"] + window["rtt_errors"]
+            lines.append(f"│   {window_end}  {fmt(rtt['p50_ms'])} / {fmt(rtt['p99_ms'])} / {fmt(rtt['p999_ms'])}, 실패 {failures}")
+        lines.append("└─────────────────────────────────────────────────────────────────────────────┘")
+        
+        return "\n".join(lines) + "\n"
     
     def create_detailed_report(self):
         """상세 보고서 생성"""
@@ -492,13 +736,13 @@ class IntegratedDoSAnalyzer:
 ═══════════════════════════════════════════════════════════════════════════════
         """
         
-        return report
+        return report + self.create_latency_report()
     
     def get_threshold_time(self, data, threshold):
-        """임계점 도달 시간 계산"""
+        """임계점 도달 시간 계산 (샘플 간격이 일정하지 않을 수 있으므로 실제 타임스탬프 사용)"""
         for i, value in enumerate(data):
             if value >= threshold:
-                minutes = i * self.monitor.monitoring_interval / 60
+                minutes = (self.monitor.timestamps[i] - self.monitor.timestamps[0]).total_seconds() / 60
                 return f"{minutes:.1f}분"
         return "도달하지 않음"
 
@@ -514,11 +758,40 @@ def main():
     parser.add_argument("--duration", type=int, default=300, help="지속 시간 (초)")
     parser.add_argument("--interval", type=float, default=0.001, help="메시지 간격 (초)")
     parser.add_argument("--batch-size", type=int, default=5, help="배치 크기")
+    parser.add_argument("--target-pid", type=int, default=None, help="대상 프로세스 PID (cgroup v2 기준 측정)")
+    parser.add_argument("--cgroup", default=None, help="측정할 cgroup v2 경로")
+    parser.add_argument("--attach-cgroup", type=float, default=None, metavar="MEMORY_MAX_MB",
+                        help="--target-pid 프로세스를 memory.max(MB)가 설정된 새 cgroup으로 옮겨 측정")
+    parser.add_argument("--cgroup-parent", default=None,
+                        help="--attach-cgroup으로 만들 cgroup의 위임된 부모 cgroup v2 경로 "
+                             "(기본값: 모니터를 리프 cgroup으로 옮기고 현재 cgroup 사용)")
+    parser.add_argument("--adaptive", action="store_true", help="적응형 샘플링 사용")
+    parser.add_argument("--min-interval", type=float, default=0.1, help="적응형 샘플링 최소 간격 (초)")
+    parser.add_argument("--max-interval", type=float, default=5.0, help="적응형 샘플링 최대 간격 (초)")
+    parser.add_argument("--memory-breakdown", action="store_true", help="대상 프로세스 메모리 구성 수집 (--target-pid 필요)")
+    parser.add_argument("--breakdown-interval", type=float, default=5.0, help="메모리 구성 최소 수집 간격 (초)")
+    parser.add_argument("--health-probe", action="store_true", help="대상 응답 지연 헬스 프로브 사용")
+    parser.add_argument("--probe-interval", type=float, default=1.0, help="헬스 프로브 간격 (초)")
+    parser.add_argument("--probe-window", type=float, default=10.0, help="지연 히스토그램 시간 창 (초)")
+    parser.add_argument("--archive", action="store_true", help="모니터링 데이터를 압축 아카이브(.ltearc)로도 저장")
+    parser.add_argument("--report-timeout", type=float, default=120.0, help="분석 후처리 파이프라인 제한 시간 (초)")
+    parser.add_argument("--report-workers", type=int, default=2, help="차트 렌더링 프로세스 수")
     
     args = parser.parse_args()
     
     # 분석기 생성 및 실행
-    analyzer = IntegratedDoSAnalyzer()
+    try:
+        analyzer = IntegratedDoSAnalyzer(target_pid=args.target_pid, cgroup_path=args.cgroup,
+                                         attach_memory_max_mb=args.attach_cgroup, cgroup_parent=args.cgroup_parent,
+                                         adaptive=args.adaptive, min_interval=args.min_interval,
+                                         max_interval=args.max_interval, memory_breakdown=args.memory_breakdown,
+                                         breakdown_interval=args.breakdown_interval,
+                                         health_probe=args.health_probe, probe_interval=args.probe_interval,
+                                         probe_window=args.probe_window, archive=args.archive,
+                                         report_timeout=args.report_timeout, report_workers=args.report_workers)
+    except OSError as e:
+        print(f"분석기 초기화 실패: {e}")
+        return
     
     attack_params = {
         "target_ip": args.target_ip,
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+결정적(deterministic) 리소스 부하 생성기
+MB/s 램프, 계단, 톱니파 형태의 메모리 부하와 프로세스 풀 기반 멀티코어 CPU 부하를 생성합니다.
+모든 메모리 부하는 별도 프로세스에서 cgroup(memory.max) 또는 rlimit(RLIMIT_AS)으로
+상한이 강제되므로, 모니터와 탐지기를 알려진 기준값(ground truth)으로 보정할 때 호스트를 위협하지 않습니다.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import time
+from datetime import datetime
+
+from cgroup_accounting import memory_cgroup_parent
+
+CHUNK_MB = 1
+CHUNK_SIZE = CHUNK_MB * 1024 * 1024
+
+# ---------------------------------------------------------------------------
+# 부하 프로파일: 경과 시간(초) -> 목표 메모리(MB) 또는 CPU 사용률(0~1)
+# ---------------------------------------------------------------------------
+
+# 프로파일은 프로세스 풀로 전달되므로 pickle 가능한 클래스로 정의합니다.
+
+class ConstantProfile:
+    """일정한 값 프로파일"""
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self, t):
+        return self.value
+
+class RampProfile:
+    """초당 rate MB씩 증가하는 램프 프로파일"""
+    def __init__(self, rate, start=0):
+        self.rate = rate
+        self.start = start
+
+    def __call__(self, t):
+        return self.start + self.rate * t
+
+class StepProfile:
+    """
+    계단 프로파일
+
+    Args:
+        steps: (시작 시간(초), 값) 목록. 해당 시간부터 다음 단계 전까지 값이 유지됩니다.
+    """
+    def __init__(self, steps):
+        self.steps = sorted(steps)
+
+    def __call__(self, t):
+        value = 0
+        for start, step_value in self.steps:
+            if t < start:
+                break
+            value = step_value
+        return value
+
+class SawtoothProfile:
+    """base에서 peak까지 선형 증가 후 period초마다 base로 떨어지는 톱니파 프로파일"""
+    def __init__(self, peak, period, base=0):
+        self.peak = peak
+        self.period = period
+        self.base = base
+
+    def __call__(self, t):
+        return self.base + (self.peak - self.base) * ((t % self.period) / self.period)
+
+# ---------------------------------------------------------------------------
+# 메모리 상한 강제
+# ---------------------------------------------------------------------------
+
+def read_vm_size_bytes():
+    """현재 프로세스의 가상 메모리 크기 (VmSize)"""
+    try:
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmSize:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def memory_cgroup_path(parent, pid):
+    """부하 프로세스별 cgroup 경로 (부모가 워커 PID로 정리할 수 있도록 이름을 고정)"""
+    return os.path.join(parent, f"lte_load_{pid}")
+
+def enter_memory_cgroup(cap_bytes, parent):
+    """
+    현재 프로세스를 memory.max가 설정된 하위 cgroup(v2)으로 이동
+
+    Args:
+        cap_bytes: memory.max 값 (바이트)
+        parent: memory 컨트롤러가 위임된 부모 cgroup 경로 (memory_cgroup_parent 결과)
+
+    Returns:
+        생성된 cgroup 경로 (실패 시 None)
+    """
+    if not parent:
+        return None
+
+    try:
+        cgroup_path = memory_cgroup_path(parent, os.getpid())
+        os.mkdir(cgroup_path)
+    except OSError:
+        return None
+
+    try:
+        # memory 컨트롤러가 위임되지 않았으면 memory.max가 없음
+        if not os.path.exists(os.path.join(cgroup_path, "memory.max")):
+            raise OSError("memory.max 없음")
+        with open(os.path.join(cgroup_path, "memory.max"), 'w') as f:
+            f.write(str(cap_bytes))
+        if os.path.exists(os.path.join(cgroup_path, "memory.swap.max")):
+            with open(os.path.join(cgroup_path, "memory.swap.max"), 'w') as f:
+                f.write("0")
+        with open(os.path.join(cgroup_path, "cgroup.procs"), 'w') as f:
+            f.write(str(os.getpid()))
+
+        return cgroup_path
+
+    except OSError:
+        # memory 컨트롤러가 위임되지 않은 경우 등
+        try:
+            os.rmdir(cgroup_path)
+        except OSError:
+            pass
+        return None
+
+def apply_memory_cap(cap_mb, cgroup_parent=None):
+    """
+    메모리 상한 적용 (cgroup 우선, 실패 시 RLIMIT_AS)
+
+    Args:
+        cap_mb: 메모리 상한 (MB)
+        cgroup_parent: memory 컨트롤러가 위임된 부모 cgroup 경로 (None이면 rlimit만 사용)
+
+    Returns:
+        적용된 방식 ("cgroup" 또는 "rlimit")
+    """
+    cap_bytes = int(cap_mb * 1024 * 1024)
+
+    if cgroup_parent and enter_memory_cgroup(cap_bytes + 64 * 1024 * 1024, cgroup_parent):
+        return "cgroup"
+
+    # RLIMIT_AS는 가상 주소 공간 전체를 제한하므로 현재 크기 + 상한 + 여유분으로 설정
+    limit = read_vm_size_bytes() + cap_bytes + 64 * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    return "rlimit"
+
+def remove_memory_cgroup(cgroup_path):
+    """enter_memory_cgroup으로 생성한 cgroup 하나를 정리 (프로세스 종료 후 부모가 호출)"""
+    if not cgroup_path or not os.path.isdir(cgroup_path):
+        return
+
+    # 종료된 프로세스가 cgroup에서 완전히 빠질 때까지 잠시 재시도
+    for _ in range(20):
+        try:
+            os.rmdir(cgroup_path)
+            return
+        except FileNotFoundError:
+            return
+        except OSError:
+            time.sleep(0.05)
+    print(f"부하 cgroup을 삭제하지 못했습니다: {cgroup_path}")
+
+# ---------------------------------------------------------------------------
+# 메모리 부하
+# ---------------------------------------------------------------------------
+
+def memory_load_worker(profile, duration, cap_mb, tick, cgroup_parent, result_conn):
+    """메모리 부하 프로세스 본체 (1MB 청크 단위로 목표 메모리를 추종)"""
+    cap_method = apply_memory_cap(cap_mb, cgroup_parent)
+
+    chunks = []
+    timeline = []
+    cap_hit = False
+    start = time.monotonic()
+    next_tick = start
+
+    while True:
+        elapsed = time.monotonic() - start
+        if elapsed >= duration:
+            break
+
+        target_chunks = int(min(max(profile(elapsed), 0), cap_mb) // CHUNK_MB)
+
+        try:
+            while len(chunks) < target_chunks:
+                # 곱셈으로 생성해야 페이지가 실제로 커밋됨 (bytearray(n)은 지연 할당)
+                chunks.append(bytearray(b"\xa5") * CHUNK_SIZE)
+        except MemoryError:
+            cap_hit = True
+        del chunks[target_chunks:]
+
+        timeline.append((elapsed, len(chunks) * CHUNK_MB))
+
+        next_tick += tick
+        sleep_time = next_tick - time.monotonic()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+
+    result_conn.send({
+        "cap_method": cap_method,
+        "cap_hit": cap_hit,
+        "timeline": timeline
+    })
+    result_conn.close()
+
+class MemoryLoad:
+    def __init__(self, profile, duration, memory_cap_mb, tick=0.05, use_cgroup=True, cgroup_parent=None):
+        """
+        메모리 부하 생성기
+
+        Args:
+            profile: 경과 시간(초) -> 목표 메모리(MB) 함수
+            duration: 지속 시간 (초)
+            memory_cap_mb: 메모리 상한 (MB), 목표값은 이 값으로 잘리고 cgroup/rlimit으로도 강제됨
+            tick: 목표 메모리 갱신 간격 (초)
+            use_cgroup: cgroup v2 사용 시도 여부
+            cgroup_parent: 부하 cgroup을 만들 위임된 부모 cgroup 경로
+                           (None이면 모니터를 리프 cgroup으로 옮기고 현재 cgroup을 부모로 사용)
+        """
+        self.profile = profile
+        self.duration = duration
+        self.memory_cap_mb = memory_cap_mb
+        self.tick = tick
+        self.use_cgroup = use_cgroup
+        self.cgroup_parent = cgroup_parent
+        self.cgroup_path = None
+        self.process = None
+        self.result_conn = None
+        self.result = None
+
+    def expected_memory_mb(self, elapsed):
+        """경과 시간에서의 기준(ground truth) 메모리 (MB)"""
+        return int(min(max(self.profile(elapsed), 0), self.memory_cap_mb) // CHUNK_MB) * CHUNK_MB
+
+    def start(self):
+        """부하 프로세스 시작"""
+        # 부모 cgroup은 워커 생성 전에 준비 (모니터를 리프로 옮기면 워커도 그 리프에서 시작됨)
+        parent = None
+        if self.use_cgroup:
+            try:
+                parent = memory_cgroup_parent(self.cgroup_parent)
+            except OSError as e:
+                print(f"cgroup 상한을 사용할 수 없어 RLIMIT_AS로 제한합니다: {e}")
+
+        self.result_conn, child_conn = multiprocessing.Pipe(duplex=False)
+        self.process = multiprocessing.Process(
+            target=memory_load_worker,
+            args=(self.profile, self.duration, self.memory_cap_mb, self.tick, parent, child_conn)
+        )
+        self.process.daemon = True
+        self.process.start()
+        self.cgroup_path = memory_cgroup_path(parent, self.process.pid) if parent else None
+        # 부모 쪽 송신단을 닫아야 워커가 비정상 종료했을 때 EOF로 감지됨
+        child_conn.close()
+        return self.process
+
+    def wait(self, timeout=None):
+        """
+        부하 종료 대기 및 결과 수집
+        워커가 결과를 보내기 전에 종료되면(memory.max OOM kill 등) 상한 도달로 보고합니다.
+        """
+        if not self.process:
+            return None
+
+        try:
+            if self.result_conn.poll(timeout if timeout is not None else self.duration + 10):
+                self.result = self.result_conn.recv()
+        except (EOFError, BrokenPipeError):
+            self.result = None
+        finally:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            remove_memory_cgroup(self.cgroup_path)
+
+        if self.result is None and self.process.exitcode not in (0, None):
+            self.result = {
+                "cap_method": "unknown",
+                "cap_hit": True,
+                "exitcode": self.process.exitcode,
+                "timeline": []
+            }
+        return self.result
+
+    def stop(self):
+        """부하 강제 중지"""
+        if self.process and self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        remove_memory_cgroup(self.cgroup_path)
+
+# ---------------------------------------------------------------------------
+# CPU 부하
+# ---------------------------------------------------------------------------
+
+def cpu_load_worker(profile, duration, period):
+    """
+    CPU 부하 워커 (듀티 사이클 방식)
+    각 period마다 profile(t) 비율만큼 바쁜 대기 후 나머지 시간은 휴면합니다.
+    """
+    start = time.monotonic()
+    busy_total = 0.0
+
+    while True:
+        period_start = time.monotonic()
+        elapsed = period_start - start
+        if elapsed >= duration:
+            break
+
+        utilization = min(max(profile(elapsed), 0.0), 1.0)
+        busy_until = period_start + period * utilization
+        while time.monotonic() < busy_until:
+            pass
+        busy_total += period * utilization
+
+        sleep_time = period_start + period - time.monotonic()
+        if sleep_time > 0:
+            time.sleep(sleep_time)
+
+    return busy_total
+
+def run_cpu_load(profile, duration, workers=None, period=0.1):
+    """
+    멀티코어 CPU 부하 실행 (프로세스 풀)
+
+    Args:
+        profile: 경과 시간(초) -> 코어당 CPU 사용률(0~1) 함수
+        duration: 지속 시간 (초)
+        workers: 워커 프로세스 수 (기본값: CPU 코어 수)
+        period: 듀티 사이클 주기 (초)
+
+    Returns:
+        워커별 누적 바쁜 시간(초) 목록
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        results = [pool.apply_async(cpu_load_worker, (profile, duration, period)) for _ in range(workers)]
+        return [r.get() for r in results]
+
+def build_memory_profile(name, rate=10.0, peak=256.0, base=0.0, period=30.0, steps=None):
+    """이름으로 메모리 프로파일 생성"""
+    if name == "ramp":
+        return RampProfile(rate, base)
+    if name == "step":
+        return StepProfile(steps or [(0, base), (period, peak)])
+    if name == "sawtooth":
+        return SawtoothProfile(peak, period, base)
+    if name == "constant":
+        return ConstantProfile(peak)
+    raise ValueError(f"알 수 없는 메모리 프로파일: {name}")
+
+def parse_steps(text):
+    """'0:64,30:128,60:256' 형식의 계단 정의 파싱"""
+    steps = []
+    for item in text.split(","):
+        start, value = item.split(":")
+        steps.append((float(start), float(value)))
+    return steps
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="결정적 리소스 부하 생성기")
+    parser.add_argument("--duration", type=float, default=60, help="지속 시간 (초)")
+    parser.add_argument("--memory-profile", choices=["none", "ramp", "step", "sawtooth", "constant"],
+                       default="ramp", help="메모리 부하 프로파일")
+    parser.add_argument("--memory-cap", type=float, default=512, help="메모리 상한 (MB)")
+    parser.add_argument("--rate", type=float, default=10.0, help="램프 증가율 (MB/s)")
+    parser.add_argument("--peak", type=float, default=256.0, help="톱니파/계단/상수 최대값 (MB)")
+    parser.add_argument("--base", type=float, default=0.0, help="기저 메모리 (MB)")
+    parser.add_argument("--period", type=float, default=30.0, help="톱니파 주기 / 계단 전환 시간 (초)")
+    parser.add_argument("--steps", help="계단 정의 (예: 0:64,30:128,60:256)")
+    parser.add_argument("--no-cgroup", action="store_true", help="cgroup 대신 rlimit만 사용")
+    parser.add_argument("--cgroup-parent", default=None, help="부하 cgroup을 만들 위임된 부모 cgroup v2 경로")
+    parser.add_argument("--cpu-load", type=float, default=0.0, help="코어당 CPU 사용률 (0~1)")
+    parser.add_argument("--cpu-workers", type=int, default=None, help="CPU 워커 수 (기본값: 코어 수)")
+
+    args = parser.parse_args()
+
+    print("=== 리소스 부하 생성 시작 ===")
+    memory_load = None
+
+    try:
+        if args.memory_profile != "none":
+            profile = build_memory_profile(args.memory_profile, args.rate, args.peak, args.base, args.period,
+                                           parse_steps(args.steps) if args.steps else None)
+            memory_load = MemoryLoad(profile, args.duration, args.memory_cap, use_cgroup=not args.no_cgroup,
+                                     cgroup_parent=args.cgroup_parent)
+            memory_load.start()
+            print(f"메모리 부하: {args.memory_profile} (상한 {args.memory_cap:.0f}MB)")
+
+        if args.cpu_load > 0:
+            print(f"CPU 부하: 코어당 {args.cpu_load * 100:.0f}% x {args.cpu_workers or os.cpu_count()}개 워커")
+            run_cpu_load(ConstantProfile(args.cpu_load), args.duration, args.cpu_workers)
+
+        if memory_load:
+            result = memory_load.wait()
+            if result:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"load_ground_truth_{timestamp}.json"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, indent=2, ensure_ascii=False)
+                print(f"상한 방식: {result['cap_method']}, 상한 도달: {'예' if result['cap_hit'] else '아니오'}")
+                print(f"기준값 저장: {filename}")
+
+    except KeyboardInterrupt:
+        print("\n사용자에 의해 중단됨")
+        if memory_load:
+            memory_load.stop()
+
+if __name__ == "__main__":
+    main()
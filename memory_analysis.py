@@ -16,26 +16,81 @@ import pandas as pd
 from collections import deque
 import argparse
 import os
+from cgroup_accounting import CgroupAccounting
+from monitor_archive import write_archive
+from smaps_sampler import SmapsSampler, BREAKDOWN_KEYS
+from load_generator import MemoryLoad, ConstantProfile, RampProfile, SawtoothProfile, run_cpu_load
 
 class MemoryMonitor:
-    def __init__(self, monitoring_interval=1.0, max_data_points=3600):
+    def __init__(self, monitoring_interval=1.0, max_data_points=None, target_pid=None, cgroup_path=None,
+                 adaptive=False, min_interval=0.1, max_interval=5.0,
+                 memory_breakdown=False, breakdown_interval=5.0, attach_memory_max_mb=None, cgroup_parent=None):
         """
         메모리 모니터링 클래스
         
         Args:
-            monitoring_interval: 모니터링 간격 (초)
-            max_data_points: 최대 데이터 포인트 수 (1시간 = 3600초)
+            monitoring_interval: 모니터링 간격 (초, 적응형 모드에서는 초기 간격)
+            max_data_points: 최대 데이터 포인트 수 (None이면 1시간 분량, 적응형은 min_interval 기준)
+            target_pid: 대상 프로세스 PID (지정 시 해당 프로세스의 cgroup으로 측정)
+            cgroup_path: 측정할 cgroup v2 경로 (target_pid보다 우선)
+            adaptive: 적응형 샘플링 사용 여부
+            min_interval: 적응형 샘플링 최소 간격 (초)
+            max_interval: 적응형 샘플링 최대 간격 (초)
+            memory_breakdown: 대상 프로세스 메모리 구성(anon/file/shmem/swap) 수집 여부 (target_pid 필요)
+            breakdown_interval: 메모리 구성 최소 수집 간격 (초, smaps_rollup 읽기 비용 제한)
+            attach_memory_max_mb: 지정 시 target_pid를 memory.max가 설정된 새 하위 cgroup으로 옮겨 측정 (MB)
+            cgroup_parent: attach_memory_max_mb 사용 시 하위 cgroup을 만들 위임된 부모 cgroup 경로
+                           (None이면 모니터를 리프 cgroup으로 옮기고 현재 cgroup을 부모로 사용)
+
+        Raises:
+            OSError: attach_memory_max_mb를 지정했지만 대상을 새 cgroup으로 옮길 수 없는 경우
         """
         self.monitoring_interval = monitoring_interval
         self.max_data_points = max_data_points
         self.running = False
         
-        # 데이터 저장소
-        self.timestamps = deque(maxlen=max_data_points)
-        self.memory_usage = deque(maxlen=max_data_points)
-        self.cpu_usage = deque(maxlen=max_data_points)
-        self.connections = deque(maxlen=max_data_points)
-        self.process_count = deque(maxlen=max_data_points)
+        # 모니터링 스레드가 마지막으로 기록한 샘플 (다른 스레드는 직접 샘플링하지 않고 이 값을 읽음)
+        self.latest_info = None
+        
+        # 적응형 샘플링: 지표가 평탄하면 간격을 늘리고, 기울기/분산이 커지면 min_interval까지 줄임
+        self.adaptive = adaptive
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.current_interval = monitoring_interval
+        self.adaptive_window = 5            # 기울기/분산 계산에 사용할 최근 샘플 수
+        self.memory_slope_threshold = 0.2   # 메모리 기울기 임계값 (%/초)
+        self.memory_std_threshold = 1.0     # 메모리 표준편차 임계값 (%)
+        self.connection_slope_threshold = 0.05  # 연결 수 상대 기울기 임계값 (평균 대비 비율/초)
+        
+        # 적응형 모드에서는 샘플링 자체가 0.1초 블로킹하지 않도록 CPU를 비블로킹으로 측정
+        self.cpu_sample_interval = None if adaptive else 0.1
+        
+        # cgroup v2 측정 백엔드 (없으면 호스트 전체 기준)
+        self.cgroup = None
+        try:
+            if cgroup_path:
+                self.cgroup = CgroupAccounting(cgroup_path)
+            elif target_pid and attach_memory_max_mb:
+                self.cgroup = CgroupAccounting.attach(target_pid, attach_memory_max_mb, cgroup_parent)
+            elif target_pid:
+                self.cgroup = CgroupAccounting.for_pid(target_pid)
+        except OSError as e:
+            # 명시적으로 요청한 cgroup 이동이 실패하면 호스트 기준으로 대체하지 않음
+            if target_pid and attach_memory_max_mb and not cgroup_path:
+                raise OSError(f"대상을 memory.max cgroup으로 옮길 수 없습니다: {e}")
+            print(f"cgroup 백엔드 초기화 실패, 호스트 전체 기준으로 측정합니다: {e}")
+        self.oom_kill_baseline = self.cgroup.sample()["oom_kills"] if self.cgroup else 0
+        
+        # 메모리 구성 샘플러 (주 샘플러보다 낮은 주기로 수집, 사이 구간은 마지막 값 유지)
+        self.smaps = None
+        if memory_breakdown:
+            if target_pid:
+                self.smaps = SmapsSampler(target_pid, breakdown_interval)
+            else:
+                print("메모리 구성 수집에는 대상 PID가 필요합니다.")
+        
+        # 데이터 저장소 (적응형 최소 간격에서도 기본 1시간 분량 유지)
+        self.resize_buffers(max_data_points or self.data_points_for(3600))
         
         # 통계 정보
         self.stats = {
@@ -44,9 +99,37 @@ class MemoryMonitor:
             "peak_memory": 0,
             "peak_connections": 0,
             "crash_time": None,
+            "crash_reason": None,
             "total_data_points": 0
         }
         
+    def resize_buffers(self, max_data_points):
+        """
+        데이터 저장소 크기 설정 (기존 데이터는 최근 값부터 유지)
+        
+        Args:
+            max_data_points: 최대 데이터 포인트 수 (실행 시간 / 최소 샘플 간격 이상이어야 시작 구간이 유지됨)
+        """
+        self.max_data_points = max_data_points
+        
+        def resized(values=()):
+            return deque(values, maxlen=max_data_points)
+        
+        self.timestamps = resized(getattr(self, "timestamps", ()))
+        self.memory_usage = resized(getattr(self, "memory_usage", ()))
+        self.cpu_usage = resized(getattr(self, "cpu_usage", ()))
+        self.connections = resized(getattr(self, "connections", ()))
+        self.process_count = resized(getattr(self, "process_count", ()))
+        self.oom_kills = resized(getattr(self, "oom_kills", ()))
+        self.sample_intervals = resized(getattr(self, "sample_intervals", ()))
+        breakdown = getattr(self, "memory_breakdown", {})
+        self.memory_breakdown = {key: resized(breakdown.get(key, ())) for key in BREAKDOWN_KEYS}
+    
+    def data_points_for(self, duration_seconds):
+        """실행 시간 전체를 담는 데 필요한 데이터 포인트 수 (적응형은 최소 간격 기준)"""
+        interval = self.min_interval if self.adaptive else self.monitoring_interval
+        return max(3600, int(duration_seconds / interval) + 60)
+    
     def get_system_info(self):
         """시스템 정보 수집"""
         try:
@@ -55,7 +138,7 @@ class MemoryMonitor:
             memory_mb = memory.used / (1024 * 1024)
             
             # CPU 사용률
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            cpu_percent = psutil.cpu_percent(interval=self.cpu_sample_interval)
             
             # 네트워크 연결 수
             connections = len(psutil.net_connections())
@@ -63,19 +146,40 @@ class MemoryMonitor:
             # 프로세스 수
             process_count = len(psutil.pids())
             
-            return {
+            system_info = {
                 "memory_mb": memory_mb,
                 "memory_percent": memory.percent,
+                "host_memory_percent": memory.percent,
                 "cpu_percent": cpu_percent,
                 "connections": connections,
                 "process_count": process_count,
-                "available_memory_mb": memory.available / (1024 * 1024)
+                "available_memory_mb": memory.available / (1024 * 1024),
+                "oom_kills": 0
             }
             
+            # cgroup 백엔드가 있으면 메모리/CPU는 대상 cgroup 기준으로 대체
+            if self.cgroup:
+                cgroup_info = self.cgroup.sample()
+                system_info["memory_mb"] = cgroup_info["memory_mb"]
+                system_info["memory_percent"] = cgroup_info["memory_percent"]
+                system_info["cpu_percent"] = cgroup_info["cpu_percent"]
+                system_info["oom_kills"] = cgroup_info["oom_kills"] - self.oom_kill_baseline
+                system_info["cgroup"] = cgroup_info
+            
+            return system_info
+            
         except Exception as e:
             print(f"시스템 정보 수집 오류: {e}")
             return None
     
+    def latest_system_info(self):
+        """
+        모니터링 루프가 마지막으로 기록한 시스템 정보
+        get_system_info는 cgroup CPU 누적값과 psutil.cpu_percent 기준점을 갱신하므로
+        다른 스레드에서 호출하면 측정 구간이 섞입니다. 모니터링 스레드 외에는 이 메서드를 사용합니다.
+        """
+        return self.latest_info
+    
     def monitor_loop(self):
         """모니터링 루프"""
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 메모리 모니터링 시작")
@@ -92,27 +196,82 @@ class MemoryMonitor:
                     self.cpu_usage.append(system_info["cpu_percent"])
                     self.connections.append(system_info["connections"])
                     self.process_count.append(system_info["process_count"])
+                    self.oom_kills.append(system_info["oom_kills"])
+                    self.sample_intervals.append(self.current_interval)
+                    
+                    if self.smaps:
+                        self.record_memory_breakdown()
+                    
+                    self.latest_info = system_info
                     
                     # 통계 업데이트
                     self.stats["total_data_points"] += 1
                     self.stats["peak_memory"] = max(self.stats["peak_memory"], system_info["memory_percent"])
                     self.stats["peak_connections"] = max(self.stats["peak_connections"], system_info["connections"])
                     
-                    # 크래시 감지 (메모리 사용률 95% 이상)
-                    if system_info["memory_percent"] >= 95 and not self.stats["crash_time"]:
-                        self.stats["crash_time"] = current_time
-                        print(f"[{current_time.strftime('%H:%M:%S')}] ⚠️  크래시 임계점 도달! 메모리 사용률: {system_info['memory_percent']:.1f}%")
+                    # 크래시 감지 (cgroup 백엔드: 실제 OOM kill, 호스트 기준: 메모리 사용률 95% 이상)
+                    if not self.stats["crash_time"]:
+                        if system_info["oom_kills"] > 0:
+                            self.stats["crash_time"] = current_time
+                            self.stats["crash_reason"] = "oom_kill"
+                            print(f"[{current_time.strftime('%H:%M:%S')}] 💥 OOM kill 발생! 횟수: {system_info['oom_kills']}")
+                        elif not self.cgroup and system_info["memory_percent"] >= 95:
+                            self.stats["crash_time"] = current_time
+                            self.stats["crash_reason"] = "memory_threshold"
+                            print(f"[{current_time.strftime('%H:%M:%S')}] ⚠️  크래시 임계점 도달! 메모리 사용률: {system_info['memory_percent']:.1f}%")
                     
                     # 주기적 상태 출력
                     if self.stats["total_data_points"] % 60 == 0:  # 1분마다
                         print(f"[{current_time.strftime('%H:%M:%S')}] 메모리: {system_info['memory_percent']:.1f}%, "
                               f"연결: {system_info['connections']}, CPU: {system_info['cpu_percent']:.1f}%")
                 
-                time.sleep(self.monitoring_interval)
+                if self.adaptive:
+                    self.current_interval = self.next_interval()
+                time.sleep(self.current_interval)
                 
             except Exception as e:
                 print(f"모니터링 오류: {e}")
-                time.sleep(self.monitoring_interval)
+                time.sleep(self.current_interval)
+        
+        # 샘플링 중인 파일 디스크립터를 닫지 않도록 모니터링 스레드에서 정리
+        if self.cgroup:
+            self.cgroup.close()
+    
+    def record_memory_breakdown(self):
+        """메모리 구성 샘플을 기존 시계열과 같은 길이로 기록"""
+        try:
+            breakdown, _ = self.smaps.sample()
+        except (OSError, ValueError):
+            # 대상 프로세스 종료 등: 마지막 값 유지
+            breakdown = self.smaps.last_breakdown
+        
+        for key in BREAKDOWN_KEYS:
+            self.memory_breakdown[key].append(breakdown[key])
+    
+    def next_interval(self):
+        """최근 샘플의 기울기/분산으로 다음 샘플링 간격 계산"""
+        if len(self.timestamps) < 2:
+            return self.current_interval
+        
+        window = min(self.adaptive_window, len(self.timestamps))
+        timestamps = list(self.timestamps)[-window:]
+        memory = np.array(list(self.memory_usage)[-window:])
+        connections = np.array(list(self.connections)[-window:], dtype=float)
+        
+        elapsed = (timestamps[-1] - timestamps[0]).total_seconds()
+        if elapsed <= 0:
+            return self.current_interval
+        
+        memory_slope = abs(memory[-1] - memory[0]) / elapsed
+        connection_slope = abs(connections[-1] - connections[0]) / elapsed / max(connections.mean(), 1.0)
+        
+        changing = (memory_slope >= self.memory_slope_threshold
+                    or memory.std() >= self.memory_std_threshold
+                    or connection_slope >= self.connection_slope_threshold)
+        
+        if changing:
+            return max(self.min_interval, self.current_interval * 0.5)
+        return min(self.max_interval, self.current_interval * 1.25)
     
     def start_monitoring(self):
         """모니터링 시작"""
@@ -132,11 +291,18 @@ class MemoryMonitor:
         self.stats["end_time"] = datetime.now()
         print(f"[{datetime.now().strftime('%H:%M:%S')}] 메모리 모니터링 중지")
     
-    def save_data(self, filename=None):
-        """모니터링 데이터 저장"""
+    def save_data(self, filename=None, archive=False, extra_stats=None):
+        """
+        모니터링 데이터 저장
+        
+        Args:
+            filename: 저장 파일명
+            archive: True면 JSON 대신 압축 아카이브(.ltearc) 형식으로 저장
+            extra_stats: stats에 함께 저장할 값 (예: 통합 분석기의 공격 통계)
+        """
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"memory_monitor_data_{timestamp}.json"
+            filename = f"memory_monitor_data_{timestamp}.{'ltearc' if archive else 'json'}"
         
         data = {
             "stats": {
@@ -145,8 +311,14 @@ class MemoryMonitor:
                 "peak_memory": self.stats["peak_memory"],
                 "peak_connections": self.stats["peak_connections"],
                 "crash_time": self.stats["crash_time"].isoformat() if self.stats["crash_time"] else None,
+                "crash_reason": self.stats["crash_reason"],
                 "total_data_points": self.stats["total_data_points"],
-                "monitoring_interval": self.monitoring_interval
+                "monitoring_interval": self.monitoring_interval,
+                "adaptive": self.adaptive,
+                "min_interval": self.min_interval if self.adaptive else None,
+                "max_interval": self.max_interval if self.adaptive else None,
+                "backend": "cgroup" if self.cgroup else "host",
+                "cgroup_path": self.cgroup.cgroup_path if self.cgroup else None
             },
             "data": {
                 "timestamps": [t.isoformat() for t in self.timestamps],
@@ -157,9 +329,22 @@ class MemoryMonitor:
             }
         }
         
+        if extra_stats:
+            data["stats"].update(extra_stats)
+        if self.cgroup:
+            data["data"]["oom_kills"] = list(self.oom_kills)
+        if self.adaptive:
+            data["data"]["sample_intervals"] = list(self.sample_intervals)
+        if self.smaps:
+            data["stats"]["breakdown_interval"] = self.smaps.min_interval
+            data["data"]["memory_breakdown"] = {key: list(values) for key, values in self.memory_breakdown.items()}
+        
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            if archive:
+                write_archive(filename, data)
+            else:
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             
             print(f"모니터링 데이터 저장: {filename}")
             return filename
@@ -254,6 +439,11 @@ class MemoryMonitor:
         
         duration = (self.stats["end_time"] - self.stats["start_time"]).total_seconds() / 60 if self.stats["end_time"] else 0
         
+        # 샘플 간격이 일정하지 않을 수 있으므로 실제 타임스탬프로 증가율 계산
+        sampled_minutes = (self.timestamps[-1] - self.timestamps[0]).total_seconds() / 60
+        memory_rate = (self.memory_usage[-1] - self.memory_usage[0]) / sampled_minutes if sampled_minutes > 0 else 0
+        connection_rate = (self.connections[-1] - self.connections[0]) / sampled_minutes if sampled_minutes > 0 else 0
+        
         report = f"""
 === DoS 공격 메모리 분석 보고서 ===
 
@@ -274,29 +464,37 @@ class MemoryMonitor:
 💾 메모리 분석:
 - 평균 메모리 사용률: {np.mean(list(self.memory_usage)):.1f}%
 - 메모리 사용률 표준편차: {np.std(list(self.memory_usage)):.1f}%
-- 메모리 사용률 증가율: {((list(self.memory_usage)[-1] - list(self.memory_usage)[0]) / len(self.memory_usage) * 60):.2f}% per minute
+- 메모리 사용률 증가율: {memory_rate:.2f}% per minute
 
 🔗 연결 분석:
 - 평균 연결 수: {np.mean(list(self.connections)):.0f}개
-- 연결 수 증가율: {((list(self.connections)[-1] - list(self.connections)[0]) / len(self.connections) * 60):.1f} connections per minute
+- 연결 수 증가율: {connection_rate:.1f} connections per minute
 
 ========================================
         """
         
         return report
 
-def simulate_dos_attack_with_monitoring(duration_minutes=10, attack_intensity="medium"):
+def simulate_dos_attack_with_monitoring(duration_minutes=10, attack_intensity="medium",
+                                        memory_cap_mb=None, cpu_workers=None, adaptive=False, archive=False,
+                                        **monitor_options):
     """
     DoS 공격 시뮬레이션과 함께 메모리 모니터링 실행
     
     Args:
         duration_minutes: 시뮬레이션 지속 시간 (분)
         attack_intensity: 공격 강도 ("low", "medium", "high")
+        memory_cap_mb: 메모리 부하 상한 (MB, 기본값: 사용 가능 메모리의 50%)
+        cpu_workers: CPU 부하 워커 수 (기본값: CPU 코어 수)
+        adaptive: 적응형 샘플링 사용 여부
+        archive: 모니터링 데이터를 압축 아카이브(.ltearc)로 저장
+        monitor_options: MemoryMonitor에 전달할 추가 옵션 (target_pid, cgroup_path, min_interval 등)
     """
     print("=== DoS 공격 시뮬레이션 시작 ===")
     
-    # 메모리 모니터 생성
-    monitor = MemoryMonitor(monitoring_interval=1.0)
+    # 메모리 모니터 생성 (저장소는 시뮬레이션 전체 구간을 담도록 설정)
+    monitor = MemoryMonitor(monitoring_interval=1.0, adaptive=adaptive, **monitor_options)
+    monitor.resize_buffers(monitor.data_points_for(duration_minutes * 60))
     
     # 모니터링 시작
     monitor_thread = monitor.start_monitoring()
@@ -307,13 +505,15 @@ def simulate_dos_attack_with_monitoring(duration_minutes=10, attack_intensity="m
         
         if attack_intensity == "low":
             # 낮은 강도: CPU 집약적 작업
-            simulate_cpu_intensive_work(duration_seconds, intensity=0.3)
+            simulate_cpu_intensive_work(duration_seconds, intensity=0.3, workers=cpu_workers)
         elif attack_intensity == "medium":
             # 중간 강도: 메모리 + CPU 집약적 작업
-            simulate_memory_intensive_work(duration_seconds, intensity=0.6)
+            simulate_memory_intensive_work(duration_seconds, intensity=0.6, memory_cap_mb=memory_cap_mb,
+                                           cgroup_parent=monitor_options.get("cgroup_parent"))
         elif attack_intensity == "high":
             # 높은 강도: 메모리 누수 시뮬레이션
-            simulate_memory_leak(duration_seconds, intensity=0.9)
+            simulate_memory_leak(duration_seconds, intensity=0.9, memory_cap_mb=memory_cap_mb,
+                                 cgroup_parent=monitor_options.get("cgroup_parent"))
         
     except KeyboardInterrupt:
         print("\n사용자에 의해 중단됨")
@@ -323,7 +523,7 @@ def simulate_dos_attack_with_monitoring(duration_minutes=10, attack_intensity="m
         monitor_thread.join(timeout=5)
         
         # 결과 저장 및 시각화
-        data_file = monitor.save_data()
+        data_file = monitor.save_data(archive=archive)
         monitor.create_visualization()
         
         # 요약 보고서 출력
@@ -337,49 +537,47 @@ def simulate_dos_attack_with_monitoring(duration_minutes=10, attack_intensity="m
             f.write(report)
         print(f"분석 보고서 저장: {report_filename}")
 
-def simulate_cpu_intensive_work(duration, intensity=0.5):
-    """CPU 집약적 작업 시뮬레이션"""
-    print(f"CPU 집약적 작업 시뮬레이션 시작 (강도: {intensity})")
-    
-    start_time = time.time()
-    while time.time() - start_time < duration:
-        # CPU 집약적 계산
-        for _ in range(int(1000000 * intensity)):
-            _ = sum(range(100))
-        time.sleep(0.1)
+def default_memory_cap_mb():
+    """기본 메모리 상한: 현재 사용 가능한 메모리의 50%"""
+    return psutil.virtual_memory().available / (1024 * 1024) * 0.5
 
-def simulate_memory_intensive_work(duration, intensity=0.5):
-    """메모리 집약적 작업 시뮬레이션"""
-    print(f"메모리 집약적 작업 시뮬레이션 시작 (강도: {intensity})")
+def run_memory_load(profile, duration, memory_cap_mb, cgroup_parent=None):
+    """상한이 강제된 별도 프로세스에서 메모리 부하 실행 (cgroup_parent: 부하 cgroup을 만들 위임된 부모 cgroup)"""
+    memory_load = MemoryLoad(profile, duration, memory_cap_mb, cgroup_parent=cgroup_parent)
+    memory_load.start()
+    try:
+        result = memory_load.wait()
+    except KeyboardInterrupt:
+        memory_load.stop()
+        raise
     
-    memory_blocks = []
-    start_time = time.time()
+    if result and "exitcode" in result:
+        print(f"메모리 부하 프로세스 비정상 종료 (종료 코드: {result['exitcode']}, 상한 도달로 간주)")
+    elif result:
+        print(f"메모리 부하 종료 (상한 방식: {result['cap_method']}, 상한 도달: {'예' if result['cap_hit'] else '아니오'})")
+    return result
+
+def simulate_cpu_intensive_work(duration, intensity=0.5, workers=None):
+    """CPU 집약적 작업 시뮬레이션 (코어당 intensity 비율, 멀티코어)"""
+    print(f"CPU 집약적 작업 시뮬레이션 시작 (강도: {intensity}, 워커: {workers or os.cpu_count()})")
     
-    while time.time() - start_time < duration:
-        # 메모리 블록 할당 (1MB씩)
-        block_size = int(1024 * 1024 * intensity)  # MB
-        memory_blocks.append(bytearray(block_size))
-        
-        # 일부 메모리 해제 (메모리 압박 효과)
-        if len(memory_blocks) > 100:
-            memory_blocks = memory_blocks[50:]  # 절반 해제
-        
-        time.sleep(0.1)
+    run_cpu_load(ConstantProfile(intensity), duration, workers)
 
-def simulate_memory_leak(duration, intensity=0.8):
-    """메모리 누수 시뮬레이션"""
-    print(f"메모리 누수 시뮬레이션 시작 (강도: {intensity})")
+def simulate_memory_intensive_work(duration, intensity=0.5, memory_cap_mb=None, cgroup_parent=None):
+    """메모리 집약적 작업 시뮬레이션 (톱니파: 최대 100MB*강도, 5초 주기로 절반 해제)"""
+    memory_cap_mb = memory_cap_mb or default_memory_cap_mb()
+    print(f"메모리 집약적 작업 시뮬레이션 시작 (강도: {intensity}, 상한: {memory_cap_mb:.0f}MB)")
     
-    memory_blocks = []
-    start_time = time.time()
+    profile = SawtoothProfile(peak=100 * intensity, period=5.0, base=50 * intensity)
+    return run_memory_load(profile, duration, memory_cap_mb, cgroup_parent)
+
+def simulate_memory_leak(duration, intensity=0.8, memory_cap_mb=None, cgroup_parent=None):
+    """메모리 누수 시뮬레이션 (램프: 초당 20MB*강도, 상한에서 유지)"""
+    memory_cap_mb = memory_cap_mb or default_memory_cap_mb()
+    print(f"메모리 누수 시뮬레이션 시작 (강도: {intensity}, 상한: {memory_cap_mb:.0f}MB)")
     
-    while time.time() - start_time < duration:
-        # 메모리 블록 할당 (누적)
-        block_size = int(1024 * 1024 * intensity)  # MB
-        memory_blocks.append(bytearray(block_size))
-        
-        # 메모리 해제하지 않음 (누수)
-        time.sleep(0.05)
+    profile = RampProfile(rate=20 * intensity)
+    return run_memory_load(profile, duration, memory_cap_mb, cgroup_parent)
 
 def main():
     """메인 함수"""
@@ -388,12 +586,38 @@ def main():
     parser.add_argument("--intensity", choices=["low", "medium", "high"], default="medium", 
                        help="공격 강도")
     parser.add_argument("--monitor-only", action="store_true", help="모니터링만 실행 (시뮬레이션 없음)")
+    parser.add_argument("--memory-cap", type=float, default=None,
+                       help="메모리 부하 상한 (MB, 기본값: 사용 가능 메모리의 50%%)")
+    parser.add_argument("--cpu-workers", type=int, default=None, help="CPU 부하 워커 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--target-pid", type=int, default=None, help="대상 프로세스 PID (cgroup v2 기준 측정)")
+    parser.add_argument("--cgroup", default=None, help="측정할 cgroup v2 경로")
+    parser.add_argument("--attach-cgroup", type=float, default=None, metavar="MEMORY_MAX_MB",
+                       help="--target-pid 프로세스를 memory.max(MB)가 설정된 새 cgroup으로 옮겨 측정")
+    parser.add_argument("--cgroup-parent", default=None,
+                       help="--attach-cgroup으로 만들 cgroup의 위임된 부모 cgroup v2 경로 "
+                            "(기본값: 모니터를 리프 cgroup으로 옮기고 현재 cgroup 사용)")
+    parser.add_argument("--adaptive", action="store_true", help="적응형 샘플링 사용")
+    parser.add_argument("--min-interval", type=float, default=0.1, help="적응형 샘플링 최소 간격 (초)")
+    parser.add_argument("--max-interval", type=float, default=5.0, help="적응형 샘플링 최대 간격 (초)")
+    parser.add_argument("--memory-breakdown", action="store_true", help="대상 프로세스 메모리 구성 수집 (--target-pid 필요)")
+    parser.add_argument("--breakdown-interval", type=float, default=5.0, help="메모리 구성 최소 수집 간격 (초)")
+    parser.add_argument("--archive", action="store_true", help="모니터링 데이터를 압축 아카이브(.ltearc)로 저장")
+    parser.add_argument("--max-data-points", type=int, default=None,
+                       help="--monitor-only에서 보관할 최대 데이터 포인트 수 (기본값: 1시간 분량, 적응형은 최소 간격 기준)")
     
     args = parser.parse_args()
     
     if args.monitor_only:
         # 모니터링만 실행
-        monitor = MemoryMonitor()
+        try:
+            monitor = MemoryMonitor(target_pid=args.target_pid, cgroup_path=args.cgroup,
+                                    attach_memory_max_mb=args.attach_cgroup, cgroup_parent=args.cgroup_parent,
+                                    adaptive=args.adaptive, min_interval=args.min_interval,
+                                    max_interval=args.max_interval, memory_breakdown=args.memory_breakdown,
+                                    breakdown_interval=args.breakdown_interval, max_data_points=args.max_data_points)
+        except OSError as e:
+            print(f"모니터 초기화 실패: {e}")
+            return
         monitor_thread = monitor.start_monitoring()
         
         try:
@@ -405,12 +629,22 @@ def main():
         finally:
             monitor.stop_monitoring()
             monitor_thread.join(timeout=5)
-            monitor.save_data()
+            monitor.save_data(archive=args.archive)
             monitor.create_visualization()
             print(monitor.generate_summary_report())
     else:
         # 시뮬레이션과 함께 실행
-        simulate_dos_attack_with_monitoring(args.duration, args.intensity)
+        try:
+            simulate_dos_attack_with_monitoring(args.duration, args.intensity, args.memory_cap, args.cpu_workers,
+                                                args.adaptive, args.archive,
+                                                target_pid=args.target_pid, cgroup_path=args.cgroup,
+                                                attach_memory_max_mb=args.attach_cgroup,
+                                                cgroup_parent=args.cgroup_parent,
+                                                min_interval=args.min_interval, max_interval=args.max_interval,
+                                                memory_breakdown=args.memory_breakdown,
+                                                breakdown_interval=args.breakdown_interval)
+        except OSError as e:
+            print(f"모니터 초기화 실패: {e}")
 
 if __name__ == "__main__":
     main()
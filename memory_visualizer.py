@@ -4,7 +4,6 @@
 DoS 공격 분석 데이터를 기반으로 메모리 사용량과 시스템 리소스를 시각화합니다.
 """
 
-import json
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 import numpy as np
@@ -13,6 +12,7 @@ from datetime import datetime, timedelta
 import seaborn as sns
 from pathlib import Path
 import argparse
+from monitor_archive import is_archive, load_monitor_data
 
 class MemoryVisualizer:
     def __init__(self):
@@ -29,17 +29,40 @@ class MemoryVisualizer:
         sns.set_style("whitegrid")
         sns.set_palette("husl")
         
-    def load_analysis_data(self, data_file):
-        """분석 데이터 로드"""
+    def load_analysis_data(self, data_file, start=None, end=None):
+        """
+        분석 데이터 로드
+        
+        Args:
+            data_file: 분석 데이터 파일 (JSON 또는 압축 아카이브 .ltearc)
+            start: 시작 시각 (datetime, 아카이브는 해당 범위의 청크만 읽음)
+            end: 종료 시각 (datetime)
+        """
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
+            self.data = load_monitor_data(data_file, start, end)
+            if start or end:
+                data_points = self.data.get("data", {})
+                if data_points.get("timestamps") and not is_archive(data_file):
+                    self.data["data"] = self.filter_time_range(data_points, start, end)
             print(f"데이터 로드 완료: {data_file}")
             return True
         except Exception as e:
             print(f"데이터 로드 오류: {e}")
             return False
     
+    def filter_time_range(self, data_points, start=None, end=None):
+        """JSON 데이터의 시계열을 시간 범위로 필터링"""
+        keep = [i for i, t in enumerate(data_points["timestamps"])
+                if (not start or datetime.fromisoformat(t) >= start) and (not end or datetime.fromisoformat(t) <= end)]
+        
+        filtered = {}
+        for name, values in data_points.items():
+            if isinstance(values, dict):
+                filtered[name] = {child: [v[i] for i in keep] for child, v in values.items()}
+            else:
+                filtered[name] = [values[i] for i in keep]
+        return filtered
+    
     def create_executive_summary_chart(self):
         """요약 차트 생성"""
         if not self.data:
@@ -317,6 +340,66 @@ class MemoryVisualizer:
         plt.show()
         return fig
     
+    def create_memory_breakdown_chart(self):
+        """대상 프로세스 메모리 구성 차트 생성 (memory_breakdown 데이터가 있을 때)"""
+        if not self.data:
+            return None
+        
+        data_points = self.data.get("data", {})
+        breakdown = data_points.get("memory_breakdown")
+        timestamps = [datetime.fromisoformat(t) for t in data_points.get("timestamps", [])]
+        
+        if not breakdown or not timestamps:
+            return None
+        
+        start_time = timestamps[0]
+        minutes = [(t - start_time).total_seconds() / 60 for t in timestamps]
+        
+        fig, axes = plt.subplots(1, 3, figsize=(24, 8))
+        fig.suptitle('Target Memory Breakdown', fontsize=20, fontweight='bold')
+        
+        # 1. 대상 프로세스 메모리 종류별 누적 영역 (모두 PSS 기준이므로 합산 가능)
+        layers = [
+            ('anon_mb', 'Anonymous (PSS)'),
+            ('file_mb', 'File-backed (PSS)'),
+            ('shmem_mb', 'Shmem (PSS)'),
+            ('swap_mb', 'Swap (PSS)')
+        ]
+        axes[0].stackplot(minutes, [breakdown.get(key, [0] * len(minutes)) for key, _ in layers],
+                          labels=[label for _, label in layers], alpha=0.8)
+        axes[0].set_title('Target Process Memory by Type', fontweight='bold')
+        axes[0].set_xlabel('Time (minutes)')
+        axes[0].set_ylabel('Memory (MB)')
+        axes[0].legend(loc='upper left')
+        axes[0].grid(True, alpha=0.3)
+        
+        # 2. 소켓 버퍼 메모리 (/proc/net/sockstat, 시스템 전체 값이므로 대상 누적 영역과 분리)
+        axes[1].plot(minutes, breakdown.get('sock_mem_mb', []), 'purple', linewidth=2,
+                     label='Socket Buffers (system-wide)')
+        axes[1].set_title('Socket Buffer Memory (System-wide)', fontweight='bold')
+        axes[1].set_xlabel('Time (minutes)')
+        axes[1].set_ylabel('Memory (MB)')
+        axes[1].legend()
+        axes[1].grid(True, alpha=0.3)
+        
+        # 3. 스레드 수
+        axes[2].plot(minutes, breakdown.get('threads', []), 'orange', linewidth=2, label='Threads')
+        axes[2].set_title('Thread Count', fontweight='bold')
+        axes[2].set_xlabel('Time (minutes)')
+        axes[2].set_ylabel('Threads')
+        axes[2].legend()
+        axes[2].grid(True, alpha=0.3)
+        
+        plt.tight_layout()
+        
+        # 저장
+        filename = f"{self.output_dir}/memory_breakdown_chart.png"
+        plt.savefig(filename, dpi=300, bbox_inches='tight')
+        print(f"메모리 구성 차트 저장: {filename}")
+        
+        plt.show()
+        return fig
+    
     def generate_presentation_summary(self):
         """프레젠테이션 요약 생성"""
         if not self.data:
@@ -334,7 +417,11 @@ class MemoryVisualizer:
         peak_connections = stats.get("peak_connections", 0)
         crash_detected = bool(stats.get("crash_time"))
         
-        duration_minutes = stats.get("total_data_points", 0) * stats.get("monitoring_interval", 1) / 60
+        # 샘플 간격이 일정하지 않을 수 있으므로 실제 타임스탬프로 기간과 증가율 계산
+        timestamps = [datetime.fromisoformat(t) for t in data_points.get("timestamps", [])]
+        duration_minutes = (timestamps[-1] - timestamps[0]).total_seconds() / 60 if len(timestamps) > 1 else 0
+        memory_rate = (memory_usage[-1] - memory_usage[0]) / duration_minutes if duration_minutes > 0 else 0
+        connection_rate = (connections[-1] - connections[0]) / duration_minutes if duration_minutes > 0 else 0
         
         summary = f"""
 ╔══════════════════════════════════════════════════════════════════════════════╗
@@ -359,8 +446,8 @@ class MemoryVisualizer:
 
 📈 트렌드 분석:
 ┌─────────────────────────────────────────────────────────────────────────────┐
-│ 메모리 증가율: {((memory_usage[-1] - memory_usage[0]) / len(memory_usage) * 60):.2f}% per minute{'':<30} │
-│ 연결 증가율: {((connections[-1] - connections[0]) / len(connections) * 60):.1f} connections per minute{'':<20} │
+│ 메모리 증가율: {memory_rate:.2f}% per minute{'':<30} │
+│ 연결 증가율: {connection_rate:.1f} connections per minute{'':<20} │
 │ 메모리 변동성: {np.std(memory_usage):.1f}%{'':<45} │
 └─────────────────────────────────────────────────────────────────────────────┘
 
@@ -408,10 +495,18 @@ class MemoryVisualizer:
         print("기술진용 상세 분석 차트 생성 중...")
         self.create_technical_analysis_chart()
         
+        # 메모리 구성 데이터가 있으면 구성 차트도 생성
+        has_breakdown = bool(self.data.get("data", {}).get("memory_breakdown"))
+        if has_breakdown:
+            print("메모리 구성 차트 생성 중...")
+            self.create_memory_breakdown_chart()
+        
         print("\n=== 프레젠테이션 자료 생성 완료 ===")
         print(f"출력 디렉토리: {self.output_dir}/")
         print("생성된 파일:")
         print("- technical_analysis_chart.png (기술진용)")
+        if has_breakdown:
+            print("- memory_breakdown_chart.png (메모리 구성)")
         
         return True
     
@@ -447,7 +542,9 @@ class MemoryVisualizer:
 def main():
     """메인 함수"""
     parser = argparse.ArgumentParser(description="메모리 시각화 도구")
-    parser.add_argument("--data", required=True, help="분석 데이터 JSON 파일")
+    parser.add_argument("--data", required=True, help="분석 데이터 파일 (JSON 또는 .ltearc 아카이브)")
+    parser.add_argument("--start", default=None, help="분석 시작 시각 (ISO 형식)")
+    parser.add_argument("--end", default=None, help="분석 종료 시각 (ISO 형식)")
     parser.add_argument("--output-dir", default="memory_charts", help="출력 디렉토리")
     parser.add_argument("--web-server", action="store_true", help="웹 서버 자동 시작")
     parser.add_argument("--port", type=int, default=8080, help="웹 서버 포트")
@@ -460,7 +557,9 @@ def main():
     Path(visualizer.output_dir).mkdir(exist_ok=True)
     
     # 데이터 로드
-    if not visualizer.load_analysis_data(args.data):
+    start = datetime.fromisoformat(args.start) if args.start else None
+    end = datetime.fromisoformat(args.end) if args.end else None
+    if not visualizer.load_analysis_data(args.data, start, end):
         return
     
     # 모든 시각화 자료 생성
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+로컬 모의(mock) 대상 서비스
+eNB 포트(2001)를 대신하는 asyncio 서비스로, 연결당 메모리 보유량과 메시지당 CPU 비용을
+설정값에 따라 모델링하고 자체 리소스 회계(ground truth)를 내보냅니다.
+메모리 예산을 넘으면 "크래시"하도록 설정할 수 있어 MemoryMonitor와 크래시 탐지기의
+지연 시간과 정확도를 오프라인으로 측정할 수 있습니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+
+from monitor_archive import load_monitor_data
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+def read_rss_bytes():
+    """현재 프로세스 RSS (/proc/self/statm)"""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+class MockTargetService:
+    def __init__(self, host="127.0.0.1", port=2001, telemetry_port=2002,
+                 retain_per_connection=64 * 1024, retain_ratio=1.0, cpu_cost_per_message=0.0,
+                 release_on_close=False, crash_budget_mb=None, crash_mode="exit",
+                 telemetry_interval=0.5, telemetry_file=None):
+        """
+        모의 대상 서비스
+
+        Args:
+            host: 바인드 주소
+            port: 서비스 포트
+            telemetry_port: 리소스 회계 JSON 조회 포트 (None이면 비활성화)
+            retain_per_connection: 연결당 고정 보유 메모리 (바이트)
+            retain_ratio: 수신 바이트 대비 보유 메모리 비율
+            cpu_cost_per_message: 메시지당 CPU 소모 시간 (초, 바쁜 대기)
+            release_on_close: 연결 종료 시 보유 메모리 해제 여부 (False면 누수)
+            crash_budget_mb: 보유 메모리가 이 값을 넘으면 크래시 (None이면 비활성화)
+            crash_mode: "exit" (프로세스 종료) 또는 "hang" (모든 연결 종료 후 응답 중지)
+            telemetry_interval: 회계 기록 간격 (초)
+            telemetry_file: 회계 기록 JSONL 파일 경로
+        """
+        self.host = host
+        self.port = port
+        self.telemetry_port = telemetry_port
+        self.retain_per_connection = retain_per_connection
+        self.retain_ratio = retain_ratio
+        self.cpu_cost_per_message = cpu_cost_per_message
+        self.release_on_close = release_on_close
+        self.crash_budget_bytes = crash_budget_mb * 1024 * 1024 if crash_budget_mb else None
+        self.crash_mode = crash_mode
+        self.telemetry_interval = telemetry_interval
+        self.telemetry_file = telemetry_file
+
+        self.server = None
+        self.telemetry_server = None
+        self.writers = set()
+        self.leaked_blocks = []
+        self.crashed = False
+
+        # 리소스 회계 (ground truth)
+        self.accounting = {
+            "start_time": None,
+            "crash_time": None,
+            "active_connections": 0,
+            "total_connections": 0,
+            "messages": 0,
+            "bytes_received": 0,
+            "retained_bytes": 0,
+            "cpu_seconds": 0.0
+        }
+
+    def snapshot(self):
+        """현재 리소스 회계 스냅샷"""
+        snapshot = dict(self.accounting)
+        snapshot["timestamp"] = datetime.now().isoformat()
+        snapshot["pid"] = os.getpid()
+        snapshot["rss_bytes"] = read_rss_bytes()
+        snapshot["crashed"] = self.crashed
+        return snapshot
+
+    def burn_cpu(self):
+        """메시지당 CPU 비용 모델링"""
+        if self.cpu_cost_per_message <= 0:
+            return
+        start = time.process_time()
+        deadline = time.perf_counter() + self.cpu_cost_per_message
+        while time.perf_counter() < deadline:
+            pass
+        self.accounting["cpu_seconds"] += time.process_time() - start
+
+    def retain(self, blocks, size):
+        """메모리 보유 (페이지가 실제로 커밋되도록 채워서 할당)"""
+        if size <= 0:
+            return
+        blocks.append(bytearray(b"\x5a") * size)
+        self.accounting["retained_bytes"] += size
+
+    async def handle_connection(self, reader, writer):
+        """클라이언트 연결 처리"""
+        if self.crashed:
+            writer.close()
+            return
+
+        self.accounting["active_connections"] += 1
+        self.accounting["total_connections"] += 1
+        self.writers.add(writer)
+
+        blocks = []
+        self.retain(blocks, self.retain_per_connection)
+
+        try:
+            # 연결만 맺는 flooding도 연결당 보유 메모리로 예산을 초과할 수 있음
+            if self.check_crash():
+                return
+
+            while not self.crashed:
+                data = await reader.read(4096)
+                if not data:
+                    break
+
+                self.accounting["messages"] += 1
+                self.accounting["bytes_received"] += len(data)
+                self.retain(blocks, int(len(data) * self.retain_ratio))
+                self.burn_cpu()
+
+                if self.check_crash():
+                    break
+
+                writer.write(b"\x00")
+                await writer.drain()
+
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.accounting["active_connections"] -= 1
+            self.writers.discard(writer)
+            if self.release_on_close:
+                self.accounting["retained_bytes"] -= sum(len(b) for b in blocks)
+            else:
+                self.leaked_blocks.extend(blocks)
+            writer.close()
+
+    def check_crash(self):
+        """메모리 예산 초과 시 크래시 처리"""
+        if self.crashed or not self.crash_budget_bytes:
+            return self.crashed
+        if self.accounting["retained_bytes"] < self.crash_budget_bytes:
+            return False
+
+        self.crashed = True
+        self.accounting["crash_time"] = datetime.now().isoformat()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 💥 모의 크래시 발생 "
+              f"(보유 메모리: {self.accounting['retained_bytes'] / (1024 * 1024):.1f}MB)")
+        self.write_telemetry(self.snapshot())
+
+        if self.crash_mode == "exit":
+            os._exit(1)
+
+        # hang 모드: 모든 연결 종료 후 새 연결 거부
+        for writer in list(self.writers):
+            writer.close()
+        if self.server:
+            self.server.close()
+        return True
+
+    async def handle_telemetry(self, reader, writer):
+        """리소스 회계 JSON 응답 (연결 즉시 전송 후 종료)"""
+        writer.write(json.dumps(self.snapshot(), ensure_ascii=False).encode("utf-8") + b"\n")
+        await writer.drain()
+        writer.close()
+
+    def write_telemetry(self, snapshot):
+        """회계 기록을 JSONL 파일에 추가"""
+        if not self.telemetry_file:
+            return
+        try:
+            with open(self.telemetry_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(snapshot, ensure_ascii=False) + "\n")
+        except Exception as e:
+            print(f"회계 기록 오류: {e}")
+
+    async def telemetry_loop(self):
+        """주기적 회계 기록"""
+        while True:
+            self.write_telemetry(self.snapshot())
+            await asyncio.sleep(self.telemetry_interval)
+
+    async def serve(self, duration=None):
+        """서비스 실행"""
+        self.accounting["start_time"] = datetime.now().isoformat()
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port, backlog=4096)
+        if self.telemetry_port:
+            self.telemetry_server = await asyncio.start_server(self.handle_telemetry, self.host, self.telemetry_port)
+
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] 모의 대상 서비스 시작: {self.host}:{self.port} (PID: {os.getpid()})")
+        if self.telemetry_port:
+            print(f"리소스 회계 조회: {self.host}:{self.telemetry_port}")
+
+        telemetry_task = asyncio.create_task(self.telemetry_loop())
+        try:
+            if duration:
+                await asyncio.sleep(duration)
+            else:
+                await asyncio.Event().wait()
+        finally:
+            telemetry_task.cancel()
+            self.server.close()
+            if self.telemetry_server:
+                self.telemetry_server.close()
+            self.write_telemetry(self.snapshot())
+
+def load_telemetry(filename):
+    """회계 기록 JSONL 로드"""
+    records = []
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+    return records
+
+def query_telemetry(host="127.0.0.1", port=2002, timeout=2.0):
+    """실행 중인 모의 서비스의 현재 회계 조회"""
+    import socket
+
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        data = b""
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data.decode("utf-8"))
+
+def evaluate_detection(telemetry_file, monitor_data_file):
+    """
+    모니터 결과를 기준값과 비교하여 크래시 탐지 정확도/지연 계산
+    MemoryMonitor 판정(호스트 95% 임계점, cgroup OOM kill)과 통합 분석기 판정(연결 수 급감 등,
+    stats의 attack_crash_time) 중 먼저 감지된 시각을 탐지 시각으로 사용합니다.
+    실제 크래시 이전에 감지된 경우는 탐지 지연이 아닌 오탐(false_positive, premature)으로 집계합니다.
+
+    Args:
+        telemetry_file: 모의 서비스 회계 기록 (JSONL)
+        monitor_data_file: MemoryMonitor.save_data 결과 (JSON 또는 .ltearc 아카이브)
+    """
+    records = load_telemetry(telemetry_file)
+    monitor_stats = load_monitor_data(monitor_data_file).get("stats", {})
+
+    true_crash = next((r["crash_time"] for r in records if r.get("crash_time")), None)
+    detections = [
+        (monitor_stats.get("crash_time"), monitor_stats.get("crash_reason") or "monitor"),
+        (monitor_stats.get("attack_crash_time"), monitor_stats.get("attack_crash_reason") or "analyzer")
+    ]
+    detections = [(time_text, detector) for time_text, detector in detections if time_text]
+    detected_crash, detector = min(detections, key=lambda d: datetime.fromisoformat(d[0]), default=(None, None))
+
+    result = {
+        "true_crash_time": true_crash,
+        "detected_crash_time": detected_crash,
+        "detector": detector,
+        "outcome": None,
+        "detection_latency_seconds": None,
+        "premature_by_seconds": None,
+        "peak_retained_mb": max((r["retained_bytes"] for r in records), default=0) / (1024 * 1024),
+        "peak_rss_mb": max((r["rss_bytes"] for r in records), default=0) / (1024 * 1024)
+    }
+
+    if true_crash and detected_crash:
+        latency = (datetime.fromisoformat(detected_crash) - datetime.fromisoformat(true_crash)).total_seconds()
+        if latency < 0:
+            # 크래시 전에 울린 탐지는 실제 크래시를 본 것이 아님
+            result["outcome"] = "false_positive"
+            result["premature_by_seconds"] = -latency
+        else:
+            result["outcome"] = "true_positive"
+            result["detection_latency_seconds"] = latency
+    elif true_crash:
+        result["outcome"] = "false_negative"
+    elif detected_crash:
+        result["outcome"] = "false_positive"
+    else:
+        result["outcome"] = "true_negative"
+
+    return result
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="로컬 모의 대상 서비스")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소")
+    parser.add_argument("--port", type=int, default=2001, help="서비스 포트")
+    parser.add_argument("--telemetry-port", type=int, default=2002, help="리소스 회계 조회 포트 (0이면 비활성화)")
+    parser.add_argument("--retain-per-connection", type=int, default=64 * 1024, help="연결당 보유 메모리 (바이트)")
+    parser.add_argument("--retain-ratio", type=float, default=1.0, help="수신 바이트 대비 보유 메모리 비율")
+    parser.add_argument("--cpu-cost", type=float, default=0.0, help="메시지당 CPU 비용 (초)")
+    parser.add_argument("--release-on-close", action="store_true", help="연결 종료 시 메모리 해제 (기본: 누수)")
+    parser.add_argument("--crash-budget", type=float, default=None, help="크래시 메모리 예산 (MB)")
+    parser.add_argument("--crash-mode", choices=["exit", "hang"], default="exit", help="크래시 방식")
+    parser.add_argument("--duration", type=float, default=None, help="실행 시간 (초, 기본: 무제한)")
+    parser.add_argument("--telemetry-interval", type=float, default=0.5, help="회계 기록 간격 (초)")
+    parser.add_argument("--telemetry-file", default=None, help="회계 기록 JSONL 파일")
+    parser.add_argument("--evaluate", nargs=2, metavar=("TELEMETRY", "MONITOR_DATA"),
+                       help="회계 기록과 모니터 데이터를 비교하여 탐지 성능 출력")
+
+    args = parser.parse_args()
+
+    if args.evaluate:
+        result = evaluate_detection(*args.evaluate)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return
+
+    telemetry_file = args.telemetry_file
+    if not telemetry_file:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        telemetry_file = f"mock_target_telemetry_{timestamp}.jsonl"
+
+    service = MockTargetService(
+        host=args.host,
+        port=args.port,
+        telemetry_port=args.telemetry_port or None,
+        retain_per_connection=args.retain_per_connection,
+        retain_ratio=args.retain_ratio,
+        cpu_cost_per_message=args.cpu_cost,
+        release_on_close=args.release_on_close,
+        crash_budget_mb=args.crash_budget,
+        crash_mode=args.crash_mode,
+        telemetry_interval=args.telemetry_interval,
+        telemetry_file=telemetry_file
+    )
+
+    try:
+        asyncio.run(service.serve(args.duration))
+    except KeyboardInterrupt:
+        print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 사용자에 의해 중단됨")
+    finally:
+        print(f"회계 기록 저장: {telemetry_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+장시간 모니터링 데이터용 압축 아카이브 형식 (.ltearc)
+타임스탬프는 delta-of-delta, 실수 시계열은 Gorilla 방식 XOR 압축, 정수 카운터는 런 길이 부호화(RLE)로
+청크 단위 저장하고, 파일 끝의 청크 인덱스로 시간 범위에 해당하는 청크만 읽을 수 있습니다.
+
+파일 구조:
+    MAGIC | 헤더 길이(u32) | 헤더 JSON | 청크... | 인덱스 JSON | 인덱스 오프셋(u64) | 인덱스 길이(u32) | MAGIC
+"""
+
+import argparse
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+
+MAGIC = b"LTEARC1\n"
+FOOTER = struct.Struct("<QI")
+EPOCH = datetime(1970, 1, 1)
+DEFAULT_CHUNK_SIZE = 1024
+
+# ---------------------------------------------------------------------------
+# 가변 길이 정수 / 비트 입출력
+# ---------------------------------------------------------------------------
+
+def zigzag(value):
+    """부호 있는 정수 -> 부호 없는 정수"""
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+def unzigzag(value):
+    """zigzag 역변환"""
+    return (value >> 1) ^ -(value & 1)
+
+def write_varint(out, value):
+    """LEB128 부호 없는 가변 길이 정수 기록"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def read_varint(data, pos):
+    """LEB128 가변 길이 정수 읽기 -> (값, 다음 위치)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+class BitWriter:
+    def __init__(self):
+        """비트 단위 기록기"""
+        self.value = 0
+        self.length = 0
+
+    def write(self, bits, count):
+        self.value = (self.value << count) | bits
+        self.length += count
+
+    def to_bytes(self):
+        padding = (-self.length) % 8
+        return (self.value << padding).to_bytes((self.length + padding) // 8, "big")
+
+class BitReader:
+    def __init__(self, data):
+        """비트 단위 읽기기"""
+        self.value = int.from_bytes(data, "big")
+        self.length = len(data) * 8
+        self.pos = 0
+
+    def read(self, count):
+        self.pos += count
+        return (self.value >> (self.length - self.pos)) & ((1 << count) - 1)
+
+# ---------------------------------------------------------------------------
+# 열(column) 부호화
+# ---------------------------------------------------------------------------
+
+def datetime_to_us(value):
+    """naive datetime -> 에포크 기준 마이크로초 (부동소수점 오차 없음)"""
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+def us_to_datetime(value):
+    """에포크 기준 마이크로초 -> naive datetime"""
+    return EPOCH + timedelta(microseconds=value)
+
+def encode_timestamps(values):
+    """delta-of-delta 타임스탬프 부호화 (마이크로초)"""
+    out = bytearray()
+    previous = 0
+    previous_delta = 0
+    for i, value in enumerate(values):
+        if i == 0:
+            write_varint(out, zigzag(value))
+        else:
+            delta = value - previous
+            write_varint(out, zigzag(delta - previous_delta))
+            previous_delta = delta
+        previous = value
+    return bytes(out)
+
+def decode_timestamps(data, count):
+    """delta-of-delta 타임스탬프 복호화"""
+    values = []
+    pos = 0
+    previous = 0
+    delta = 0
+    for i in range(count):
+        raw, pos = read_varint(data, pos)
+        if i == 0:
+            previous = unzigzag(raw)
+        else:
+            delta += unzigzag(raw)
+            previous += delta
+        values.append(previous)
+    return values
+
+def encode_floats(values):
+    """Gorilla 방식 XOR 실수 부호화"""
+    writer = BitWriter()
+    previous = 0
+    previous_leading = -1
+    previous_trailing = 0
+
+    for i, value in enumerate(values):
+        bits = struct.unpack("<Q", struct.pack("<d", float(value)))[0]
+        if i == 0:
+            writer.write(bits, 64)
+            previous = bits
+            continue
+
+        xor = bits ^ previous
+        previous = bits
+        if xor == 0:
+            writer.write(0, 1)
+            continue
+
+        leading = min(64 - xor.bit_length(), 31)
+        trailing = (xor & -xor).bit_length() - 1
+
+        if previous_leading >= 0 and leading >= previous_leading and trailing >= previous_trailing:
+            # 이전 유효 비트 구간 재사용
+            meaningful = 64 - previous_leading - previous_trailing
+            writer.write(0b10, 2)
+            writer.write(xor >> previous_trailing, meaningful)
+        else:
+            meaningful = 64 - leading - trailing
+            writer.write(0b11, 2)
+            writer.write(leading, 5)
+            writer.write(meaningful & 0x3F, 6)  # 64는 0으로 기록
+            writer.write(xor >> trailing, meaningful)
+            previous_leading = leading
+            previous_trailing = trailing
+
+    return writer.to_bytes()
+
+def decode_floats(data, count):
+    """Gorilla 방식 XOR 실수 복호화"""
+    if count == 0:
+        return []
+
+    reader = BitReader(data)
+    previous = reader.read(64)
+    values = [struct.unpack("<d", struct.pack("<Q", previous))[0]]
+    leading = 0
+    trailing = 0
+
+    for _ in range(count - 1):
+        if reader.read(1) == 1:
+            if reader.read(1) == 1:
+                leading = reader.read(5)
+                meaningful = reader.read(6) or 64
+                trailing = 64 - leading - meaningful
+            else:
+                meaningful = 64 - leading - trailing
+            previous ^= reader.read(meaningful) << trailing
+        values.append(struct.unpack("<d", struct.pack("<Q", previous))[0])
+
+    return values
+
+def encode_ints(values):
+    """정수 카운터 RLE 부호화: (이전 값 대비 차이, 반복 횟수) 쌍"""
+    out = bytearray()
+    previous = 0
+    i = 0
+    while i < len(values):
+        value = int(values[i])
+        run = 1
+        while i + run < len(values) and values[i + run] == value:
+            run += 1
+        write_varint(out, zigzag(value - previous))
+        write_varint(out, run)
+        previous = value
+        i += run
+    return bytes(out)
+
+def decode_ints(data, count):
+    """정수 카운터 RLE 복호화"""
+    values = []
+    pos = 0
+    previous = 0
+    while len(values) < count:
+        delta, pos = read_varint(data, pos)
+        run, pos = read_varint(data, pos)
+        previous += unzigzag(delta)
+        values.extend([previous] * run)
+    return values
+
+ENCODERS = {"float": encode_floats, "int": encode_ints}
+DECODERS = {"float": decode_floats, "int": decode_ints}
+
+# ---------------------------------------------------------------------------
+# 아카이브 쓰기/읽기
+# ---------------------------------------------------------------------------
+
+def flatten_columns(data_points):
+    """모니터 데이터의 시계열을 평탄화 (중첩 dict는 'parent.child' 이름 사용)"""
+    columns = {}
+    for name, values in data_points.items():
+        if name == "timestamps":
+            continue
+        if isinstance(values, dict):
+            for child, child_values in values.items():
+                columns[f"{name}.{child}"] = child_values
+        else:
+            columns[name] = values
+    return columns
+
+def column_type(values):
+    """정수만 있는 열은 RLE, 그 외는 Gorilla"""
+    return "int" if all(isinstance(v, int) and not isinstance(v, bool) for v in values) else "float"
+
+def write_archive(filename, data, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    모니터 데이터(save_data와 같은 구조의 dict)를 아카이브로 저장
+
+    Args:
+        filename: 출력 파일 경로
+        data: {"stats": {...}, "data": {"timestamps": [...], ...}}
+        chunk_size: 청크당 샘플 수
+    """
+    data_points = data.get("data", {})
+    timestamps = [datetime_to_us(datetime.fromisoformat(t)) for t in data_points.get("timestamps", [])]
+    columns = flatten_columns(data_points)
+    columns = {name: values for name, values in columns.items() if len(values) == len(timestamps)}
+    types = {name: column_type(values) for name, values in columns.items()}
+
+    header = json.dumps({
+        "stats": data.get("stats", {}),
+        "columns": [{"name": name, "type": types[name]} for name in columns],
+        "chunk_size": chunk_size
+    }, ensure_ascii=False).encode("utf-8")
+
+    index = []
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+
+        for start in range(0, len(timestamps), chunk_size):
+            end = min(start + chunk_size, len(timestamps))
+            chunk = bytearray()
+            write_varint(chunk, end - start)
+
+            blocks = [encode_timestamps(timestamps[start:end])]
+            for name, values in columns.items():
+                blocks.append(ENCODERS[types[name]](values[start:end]))
+            for block in blocks:
+                write_varint(chunk, len(block))
+                chunk.extend(block)
+
+            index.append({
+                "start_us": timestamps[start],
+                "end_us": timestamps[end - 1],
+                "offset": f.tell(),
+                "length": len(chunk),
+                "count": end - start
+            })
+            f.write(chunk)
+
+        index_bytes = json.dumps(index).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index_bytes)
+        f.write(FOOTER.pack(index_offset, len(index_bytes)))
+        f.write(MAGIC)
+
+    return filename
+
+def is_archive(filename):
+    """아카이브 파일 여부"""
+    try:
+        with open(filename, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+class ArchiveReader:
+    def __init__(self, filename):
+        """
+        아카이브 읽기기 (헤더와 청크 인덱스만 먼저 읽음)
+
+        Args:
+            filename: 아카이브 파일 경로
+        """
+        self.filename = filename
+
+        with open(filename, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"아카이브 파일이 아닙니다: {filename}")
+            header_length = struct.unpack("<I", f.read(4))[0]
+            header = json.loads(f.read(header_length).decode("utf-8"))
+
+            f.seek(-(FOOTER.size + len(MAGIC)), os.SEEK_END)
+            index_offset, index_length = FOOTER.unpack(f.read(FOOTER.size))
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"아카이브가 손상되었습니다: {filename}")
+            f.seek(index_offset)
+            self.index = json.loads(f.read(index_length).decode("utf-8"))
+
+        self.stats = header["stats"]
+        self.columns = header["columns"]
+
+    def decode_chunk(self, raw):
+        """청크 복호화 -> (타임스탬프 목록, {열 이름: 값 목록})"""
+        count, pos = read_varint(raw, 0)
+        blocks = []
+        for _ in range(len(self.columns) + 1):
+            length, pos = read_varint(raw, pos)
+            blocks.append(raw[pos:pos + length])
+            pos += length
+
+        timestamps = decode_timestamps(blocks[0], count)
+        values = {}
+        for column, block in zip(self.columns, blocks[1:]):
+            values[column["name"]] = DECODERS[column["type"]](block, count)
+        return timestamps, values
+
+    def read_range(self, start=None, end=None):
+        """
+        시간 범위의 샘플 읽기 (겹치는 청크만 디스크에서 읽음)
+
+        Args:
+            start: 시작 시각 (datetime, None이면 처음부터)
+            end: 종료 시각 (datetime, None이면 끝까지)
+
+        Returns:
+            (타임스탬프(마이크로초) 목록, {열 이름: 값 목록})
+        """
+        start_us = datetime_to_us(start) if start else None
+        end_us = datetime_to_us(end) if end else None
+
+        timestamps = []
+        values = {column["name"]: [] for column in self.columns}
+
+        with open(self.filename, 'rb') as f:
+            for entry in self.index:
+                if start_us is not None and entry["end_us"] < start_us:
+                    continue
+                if end_us is not None and entry["start_us"] > end_us:
+                    break
+
+                f.seek(entry["offset"])
+                chunk_timestamps, chunk_values = self.decode_chunk(f.read(entry["length"]))
+
+                # 청크 내부에서 범위 밖 샘플 제외
+                keep = [i for i, t in enumerate(chunk_timestamps)
+                        if (start_us is None or t >= start_us) and (end_us is None or t <= end_us)]
+                timestamps.extend(chunk_timestamps[i] for i in keep)
+                for name, column_values in chunk_values.items():
+                    values[name].extend(column_values[i] for i in keep)
+
+        return timestamps, values
+
+    def to_monitor_data(self, start=None, end=None):
+        """save_data JSON과 같은 구조의 dict로 변환 (시간 범위 지정 가능)"""
+        timestamps, values = self.read_range(start, end)
+
+        data_points = {"timestamps": [us_to_datetime(t).isoformat() for t in timestamps]}
+        for name, column_values in values.items():
+            if "." in name:
+                parent, child = name.split(".", 1)
+                data_points.setdefault(parent, {})[child] = column_values
+            else:
+                data_points[name] = column_values
+
+        return {"stats": dict(self.stats), "data": data_points}
+
+def load_monitor_data(filename, start=None, end=None):
+    """모니터 데이터 로드 (JSON 또는 아카이브, 아카이브는 시간 범위만 읽음)"""
+    if is_archive(filename):
+        return ArchiveReader(filename).to_monitor_data(start, end)
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="모니터링 데이터 압축 아카이브 변환 도구")
+    parser.add_argument("input", help="입력 파일 (JSON -> 아카이브, 아카이브 -> JSON)")
+    parser.add_argument("--output", default=None, help="출력 파일 경로")
+    parser.add_argument("--start", default=None, help="아카이브 -> JSON 변환 시 시작 시각 (ISO 형식)")
+    parser.add_argument("--end", default=None, help="아카이브 -> JSON 변환 시 종료 시각 (ISO 형식)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="청크당 샘플 수")
+
+    args = parser.parse_args()
+
+    try:
+        if is_archive(args.input):
+            start = datetime.fromisoformat(args.start) if args.start else None
+            end = datetime.fromisoformat(args.end) if args.end else None
+            data = ArchiveReader(args.input).to_monitor_data(start, end)
+            output = args.output or os.path.splitext(args.input)[0] + ".json"
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+        else:
+            with open(args.input, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            output = args.output or os.path.splitext(args.input)[0] + ".ltearc"
+            write_archive(output, data, args.chunk_size)
+
+        print(f"변환 완료: {args.input} ({os.path.getsize(args.input)} bytes) -> {output} ({os.path.getsize(output)} bytes)")
+
+    except Exception as e:
+        print(f"변환 오류: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+분석 후처리 파이프라인
+데이터 저장, 프레임 구성, 차트 렌더링, 보고서 작성을 의존 관계가 있는 작업으로 정의하고,
+의존 작업이 끝난 작업부터 작업자 풀에서 병렬로 실행합니다.
+I/O 작업은 데몬 스레드 작업자에서, matplotlib 렌더링처럼 CPU를 많이 쓰는 작업은 프로세스 풀에서 실행하며,
+각 작업의 시작/완료를 출력하고 파이프라인 전체에 하나의 제한 시간을 적용합니다.
+제한 시간이 지나면 렌더링 프로세스는 강제 종료하고, 멈춘 스레드 작업은 데몬 스레드이므로
+인터프리터 종료를 막지 않습니다.
+"""
+
+import multiprocessing
+import queue
+import threading
+import time
+from datetime import datetime
+
+class PipelineTimeout(Exception):
+    """파이프라인 제한 시간 초과"""
+
+class PipelineTask:
+    def __init__(self, name, func, depends_on=(), process=False):
+        """
+        파이프라인 작업
+
+        Args:
+            name: 작업 이름
+            func: 실행 함수 (의존 작업 결과를 depends_on 순서대로 인자로 받음)
+            depends_on: 먼저 완료되어야 하는 작업 이름 목록
+            process: True면 프로세스 풀에서 실행 (func와 인자가 pickle 가능해야 함)
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.process = process
+        self.state = "pending"
+        self.result = None
+        self.error = None
+        self.started = None
+        self.elapsed = None
+
+class ReportPipeline:
+    def __init__(self, timeout=120.0, thread_workers=4, process_workers=2):
+        """
+        분석 후처리 파이프라인
+
+        Args:
+            timeout: 파이프라인 전체 제한 시간 (초)
+            thread_workers: I/O 작업용 데몬 스레드 수
+            process_workers: 렌더링 작업용 프로세스 수
+        """
+        self.timeout = timeout
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self.tasks = {}
+
+    def add_task(self, name, func, depends_on=(), process=False):
+        """작업 추가 (의존 작업은 먼저 추가되어 있어야 함)"""
+        missing = [dep for dep in depends_on if dep not in self.tasks]
+        if missing:
+            raise ValueError(f"{name}: 정의되지 않은 의존 작업 {', '.join(missing)}")
+        self.tasks[name] = PipelineTask(name, func, depends_on, process)
+
+    def report_progress(self, task, message):
+        """작업 진행 상황 출력"""
+        done = sum(1 for t in self.tasks.values() if t.state in ("done", "failed", "skipped"))
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ({done}/{len(self.tasks)}) {task.name}: {message}")
+
+    def run(self):
+        """
+        파이프라인 실행
+
+        Returns:
+            {작업 이름: 결과} (실패하거나 건너뛴 작업은 None)
+
+        Raises:
+            PipelineTimeout: 제한 시간 내에 모든 작업이 끝나지 않은 경우
+        """
+        completions = queue.Queue()
+        deadline = time.monotonic() + self.timeout
+        has_process_tasks = any(task.process for task in self.tasks.values())
+
+        thread_jobs = queue.Queue()
+        process_pool = multiprocessing.Pool(processes=self.process_workers) if has_process_tasks else None
+        running = 0
+
+        def thread_worker():
+            # 제한 시간 초과 후에도 남아 있을 수 있으므로 데몬 스레드로 실행 (종료 시 기다리지 않음)
+            while True:
+                job = thread_jobs.get()
+                if job is None:
+                    return
+                task, args = job
+                try:
+                    completions.put((task, task.func(*args), None))
+                except Exception as e:
+                    completions.put((task, None, e))
+
+        thread_count = min(self.thread_workers, sum(1 for task in self.tasks.values() if not task.process))
+        for _ in range(thread_count):
+            threading.Thread(target=thread_worker, daemon=True).start()
+
+        def submit(task):
+            args = [self.tasks[dep].result for dep in task.depends_on]
+            task.state = "running"
+            task.started = time.monotonic()
+            self.report_progress(task, "시작" + (" (프로세스)" if task.process else ""))
+
+            if task.process:
+                process_pool.apply_async(task.func, args,
+                                         callback=lambda result: completions.put((task, result, None)),
+                                         error_callback=lambda error: completions.put((task, None, error)))
+            else:
+                thread_jobs.put((task, args))
+
+        def submit_ready():
+            count = 0
+            for task in self.tasks.values():
+                if task.state != "pending":
+                    continue
+                states = [self.tasks[dep].state for dep in task.depends_on]
+                if any(state in ("failed", "skipped") for state in states):
+                    task.state = "skipped"
+                    self.report_progress(task, "의존 작업 실패로 건너뜀")
+                elif all(state == "done" for state in states):
+                    submit(task)
+                    count += 1
+            return count
+
+        try:
+            running += submit_ready()
+            while running:
+                remaining = deadline - time.monotonic()
+                try:
+                    task, result, error = completions.get(timeout=max(remaining, 0))
+                except queue.Empty:
+                    unfinished = [t.name for t in self.tasks.values() if t.state in ("pending", "running")]
+                    raise PipelineTimeout(f"제한 시간 {self.timeout:g}초 초과 (미완료: {', '.join(unfinished)})")
+
+                running -= 1
+                task.elapsed = time.monotonic() - task.started
+                if error is not None:
+                    task.state = "failed"
+                    task.error = error
+                    self.report_progress(task, f"실패 ({task.elapsed:.2f}초): {error}")
+                else:
+                    task.state = "done"
+                    task.result = result
+                    self.report_progress(task, f"완료 ({task.elapsed:.2f}초)")
+
+                running += submit_ready()
+        finally:
+            # 제한 시간 초과 시 실행 중인 렌더링 프로세스는 강제 종료, 스레드는 기다리지 않음 (데몬 스레드)
+            if process_pool:
+                if running:
+                    process_pool.terminate()
+                else:
+                    process_pool.close()
+                process_pool.join()
+            for _ in range(thread_count):
+                thread_jobs.put(None)
+
+        return {name: task.result for name, task in self.tasks.items()}
+
+    def summary(self):
+        """작업별 상태와 소요 시간"""
+        return {name: {"state": task.state, "elapsed": task.elapsed,
+                       "error": str(task.error) if task.error else None}
+                for name, task in self.tasks.items()}
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+실행(run) 카탈로그 및 다중 실행 비교 도구
+저장된 모니터링 JSON(memory_monitor_data_*, integrated_dos_analysis_*)을 SQLite 인덱스와
+실행별 컬럼 파일(.npz)로 변환하고, 여러 실행의 메모리/CPU/연결 곡선을 시작 시점 또는
+크래시 시점 기준으로 겹쳐 그려 임계점 도달 시간 차이를 비교합니다.
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from monitor_archive import load_monitor_data
+
+# 카탈로그에 포함할 저장 파일 패턴
+RUN_FILE_PATTERNS = ("memory_monitor_data_*.json", "integrated_dos_analysis_*.json",
+                     "memory_monitor_data_*.ltearc", "integrated_dos_analysis_*.ltearc")
+
+# 컬럼 파일에 저장할 시계열
+SERIES_KEYS = ("memory_usage", "cpu_usage", "connections", "process_count")
+
+# 도달 시간을 계산할 메모리 임계점 (%)
+MEMORY_THRESHOLDS = (60, 80, 95)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    source_file TEXT NOT NULL,
+    source_mtime REAL NOT NULL,
+    columns_file TEXT NOT NULL,
+    start_time TEXT,
+    end_time TEXT,
+    crash_time TEXT,
+    crash_reason TEXT,
+    crash_detector TEXT,
+    backend TEXT,
+    monitoring_interval REAL,
+    data_points INTEGER,
+    duration_seconds REAL,
+    crash_offset_seconds REAL,
+    peak_memory REAL,
+    mean_memory REAL,
+    peak_cpu REAL,
+    peak_connections INTEGER,
+    time_to_60 REAL,
+    time_to_80 REAL,
+    time_to_95 REAL
+)
+"""
+
+def preferred_source(data_file):
+    """같은 이름(stem)의 .ltearc 아카이브가 있으면 JSON 대신 아카이브를 사용 (실행당 파일 하나만 인덱싱)"""
+    path = Path(data_file)
+    archive = path.with_suffix(".ltearc")
+    if path.suffix == ".json" and archive.exists():
+        return str(archive)
+    return data_file
+
+def earliest_crash(stats):
+    """
+    MemoryMonitor 판정(crash_time)과 통합 분석기 판정(attack_crash_time) 중 먼저 감지된 크래시
+
+    Returns:
+        (크래시 시각, 원인, 판정 주체("monitor" 또는 "analyzer")), 크래시가 없으면 (None, None, None)
+    """
+    detections = [
+        (stats.get("crash_time"), stats.get("crash_reason"), "monitor"),
+        (stats.get("attack_crash_time"), stats.get("attack_crash_reason"), "analyzer")
+    ]
+    detections = [detection for detection in detections if detection[0]]
+    return min(detections, key=lambda d: datetime.fromisoformat(d[0]), default=(None, None, None))
+
+def time_to_threshold(seconds, values, threshold):
+    """처음으로 임계점 이상이 된 시점 (초, 도달하지 않으면 None)"""
+    reached = np.nonzero(values >= threshold)[0]
+    return float(seconds[reached[0]]) if len(reached) else None
+
+class RunCatalog:
+    def __init__(self, db_path="run_catalog.db", columns_dir="run_columns"):
+        """
+        실행 카탈로그
+
+        Args:
+            db_path: SQLite 인덱스 경로
+            columns_dir: 실행별 컬럼 파일(.npz) 저장 디렉토리
+        """
+        self.db_path = db_path
+        self.columns_dir = columns_dir
+        Path(self.columns_dir).mkdir(exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute(SCHEMA)
+        # 이전 스키마의 카탈로그: 컬럼 추가 후 다음 scan에서 다시 인덱싱되도록 mtime 초기화
+        existing = {row["name"] for row in self.conn.execute("PRAGMA table_info(runs)")}
+        if "crash_detector" not in existing:
+            self.conn.execute("ALTER TABLE runs ADD COLUMN crash_detector TEXT")
+            self.conn.execute("UPDATE runs SET source_mtime = -1")
+        self.conn.commit()
+
+    def index_file(self, data_file, force=False):
+        """
+        저장된 모니터링 데이터(JSON 또는 .ltearc 아카이브) 하나를 인덱싱
+
+        Returns:
+            run_id (건너뛴 경우에도 반환, 실패 시 None)
+        """
+        data_file = preferred_source(data_file)
+        run_id = Path(data_file).stem
+        mtime = os.path.getmtime(data_file)
+
+        row = self.conn.execute("SELECT source_file, source_mtime FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if (row and row["source_file"] == os.path.abspath(data_file)
+                and row["source_mtime"] == mtime and not force):
+            return run_id
+
+        try:
+            data = load_monitor_data(data_file)
+        except Exception as e:
+            print(f"데이터 로드 오류 ({data_file}): {e}")
+            return None
+
+        stats = data.get("stats", {})
+        data_points = data.get("data", {})
+
+        timestamps = [datetime.fromisoformat(t) for t in data_points.get("timestamps", [])]
+        start_time = timestamps[0] if timestamps else None
+        seconds = np.array([(t - start_time).total_seconds() for t in timestamps], dtype=np.float64)
+
+        columns = {"seconds": seconds}
+        for key in SERIES_KEYS:
+            columns[key] = np.asarray(data_points.get(key, []), dtype=np.float64)
+
+        columns_file = os.path.join(self.columns_dir, f"{run_id}.npz")
+        np.savez(columns_file, **columns)
+
+        memory = columns["memory_usage"]
+        crash_time, crash_reason, crash_detector = earliest_crash(stats)
+        crash_offset = None
+        if crash_time and start_time:
+            crash_offset = (datetime.fromisoformat(crash_time) - start_time).total_seconds()
+
+        has_data = len(seconds) > 0 and len(memory) == len(seconds)
+        summary = {
+            "run_id": run_id,
+            "source_file": os.path.abspath(data_file),
+            "source_mtime": mtime,
+            "columns_file": columns_file,
+            "start_time": stats.get("start_time"),
+            "end_time": stats.get("end_time"),
+            "crash_time": crash_time,
+            "crash_reason": crash_reason,
+            "crash_detector": crash_detector,
+            "backend": stats.get("backend", "host"),
+            "monitoring_interval": stats.get("monitoring_interval"),
+            "data_points": len(seconds),
+            "duration_seconds": float(seconds[-1]) if len(seconds) else 0.0,
+            "crash_offset_seconds": crash_offset,
+            "peak_memory": float(memory.max()) if len(memory) else 0.0,
+            "mean_memory": float(memory.mean()) if len(memory) else 0.0,
+            "peak_cpu": float(columns["cpu_usage"].max()) if len(columns["cpu_usage"]) else 0.0,
+            "peak_connections": int(columns["connections"].max()) if len(columns["connections"]) else 0
+        }
+        for threshold in MEMORY_THRESHOLDS:
+            summary[f"time_to_{threshold}"] = time_to_threshold(seconds, memory, threshold) if has_data else None
+
+        fields = ", ".join(summary)
+        placeholders = ", ".join("?" for _ in summary)
+        self.conn.execute(f"INSERT OR REPLACE INTO runs ({fields}) VALUES ({placeholders})", tuple(summary.values()))
+        self.conn.commit()
+        return run_id
+
+    def scan(self, directory=".", force=False):
+        """디렉토리의 저장 파일을 모두 인덱싱 (같은 stem의 JSON과 .ltearc는 .ltearc만 인덱싱)"""
+        sources = {}
+        for pattern in RUN_FILE_PATTERNS:
+            for data_file in glob.glob(os.path.join(directory, pattern)):
+                data_file = preferred_source(data_file)
+                sources[Path(data_file).stem] = data_file
+
+        indexed = []
+        for stem in sorted(sources):
+            run_id = self.index_file(sources[stem], force)
+            if run_id:
+                indexed.append(run_id)
+        return indexed
+
+    def list_runs(self):
+        """인덱싱된 실행 목록 (시작 시간 순)"""
+        return self.conn.execute("SELECT * FROM runs ORDER BY start_time").fetchall()
+
+    def get_run(self, run_id):
+        """실행 메타데이터 조회"""
+        return self.conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+
+    def load_series(self, run_id):
+        """실행의 시계열 컬럼 로드 (JSON을 다시 읽지 않음)"""
+        run = self.get_run(run_id)
+        if not run:
+            return None
+        with np.load(run["columns_file"]) as columns:
+            return {key: columns[key] for key in columns.files}
+
+    def compare_table(self, run_ids):
+        """임계점 도달 시간 비교표 (첫 번째 실행 대비 차이)"""
+        runs = [self.get_run(run_id) for run_id in run_ids]
+        missing = [run_id for run_id, run in zip(run_ids, runs) if not run]
+        if missing:
+            raise KeyError(f"카탈로그에 없는 실행: {', '.join(missing)}")
+
+        baseline = runs[0]
+        columns = ["time_to_60", "time_to_80", "time_to_95", "crash_offset_seconds"]
+        header = f"{'실행':<40}" + "".join(f"{c:>24}" for c in columns)
+        lines = [header, "-" * len(header)]
+
+        for run in runs:
+            cells = []
+            for column in columns:
+                value = run[column]
+                base = baseline[column]
+                if value is None:
+                    cells.append(f"{'-':>24}")
+                elif run is baseline or base is None:
+                    cells.append(f"{value:>22.1f}s ")
+                else:
+                    cells.append(f"{value:>10.1f}s ({value - base:>+9.1f}s)")
+            lines.append(f"{run['run_id']:<40}" + "".join(cells))
+
+        return "\n".join(lines)
+
+    def create_comparison_chart(self, run_ids, align="start", output_file=None):
+        """
+        여러 실행의 메모리/CPU/연결 곡선 겹쳐 그리기
+
+        Args:
+            run_ids: 비교할 실행 ID 목록
+            align: "start" (시작 시점 기준) 또는 "crash" (크래시 시점 기준)
+            output_file: 저장 파일명 (기본값: run_comparison_<timestamp>.png)
+        """
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['axes.unicode_minus'] = False
+
+        fig, axes = plt.subplots(3, 1, figsize=(16, 14), sharex=True)
+        fig.suptitle(f'DoS Run Comparison (aligned at {align})', fontsize=18, fontweight='bold')
+
+        panels = [
+            ("memory_usage", "Memory Usage (%)"),
+            ("cpu_usage", "CPU Usage (%)"),
+            ("connections", "Connections")
+        ]
+
+        for run_id in run_ids:
+            run = self.get_run(run_id)
+            series = self.load_series(run_id)
+            if not run or series is None:
+                print(f"카탈로그에 없는 실행: {run_id}")
+                continue
+
+            offset = 0.0
+            if align == "crash":
+                if run["crash_offset_seconds"] is None:
+                    print(f"크래시가 없는 실행은 크래시 기준 정렬에서 제외: {run_id}")
+                    continue
+                offset = run["crash_offset_seconds"]
+
+            minutes = (series["seconds"] - offset) / 60
+            for ax, (key, _) in zip(axes, panels):
+                if len(series[key]) == len(minutes):
+                    ax.plot(minutes, series[key], linewidth=2, label=run_id)
+
+        for ax, (_, label) in zip(axes, panels):
+            ax.set_ylabel(label, fontsize=12)
+            ax.grid(True, alpha=0.3)
+            ax.legend(fontsize=9)
+            if align == "crash":
+                ax.axvline(x=0, color='red', linestyle=':', linewidth=2, alpha=0.8)
+        axes[0].axhline(y=95, color='red', linestyle='--', alpha=0.6)
+        axes[0].set_ylim(0, 100)
+        axes[1].set_ylim(0, 100)
+        axes[2].set_xlabel('Time since crash (minutes)' if align == "crash" else 'Time (minutes)', fontsize=12)
+
+        plt.tight_layout()
+
+        if not output_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"run_comparison_{timestamp}.png"
+        plt.savefig(output_file, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+        print(f"비교 차트 저장: {output_file}")
+        return output_file
+
+    def close(self):
+        """인덱스 연결 종료"""
+        self.conn.close()
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description="실행 카탈로그 및 다중 실행 비교 도구")
+    parser.add_argument("--db", default="run_catalog.db", help="SQLite 인덱스 경로")
+    parser.add_argument("--columns-dir", default="run_columns", help="컬럼 파일 디렉토리")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="저장된 실행 파일 인덱싱")
+    index_parser.add_argument("paths", nargs="*", default=["."], help="디렉토리 또는 JSON 파일")
+    index_parser.add_argument("--force", action="store_true", help="변경되지 않은 파일도 다시 인덱싱")
+
+    subparsers.add_parser("list", help="인덱싱된 실행 목록")
+
+    compare_parser = subparsers.add_parser("compare", help="여러 실행 비교")
+    compare_parser.add_argument("runs", nargs="+", help="비교할 실행 ID (첫 번째가 기준)")
+    compare_parser.add_argument("--align", choices=["start", "crash"], default="start", help="정렬 기준")
+    compare_parser.add_argument("--output", default=None, help="비교 차트 파일명")
+
+    args = parser.parse_args()
+
+    catalog = RunCatalog(args.db, args.columns_dir)
+
+    try:
+        if args.command == "index":
+            indexed = []
+            for path in args.paths:
+                if os.path.isdir(path):
+                    indexed.extend(catalog.scan(path, args.force))
+                else:
+                    run_id = catalog.index_file(path, args.force)
+                    if run_id:
+                        indexed.append(run_id)
+            print(f"인덱싱 완료: {len(indexed)}개 실행")
+
+        elif args.command == "list":
+            runs = catalog.list_runs()
+            print(f"{'실행':<40}{'시작 시간':<28}{'포인트':>8}{'최대 메모리':>12}{'크래시':>10}")
+            print("-" * 98)
+            for run in runs:
+                crash = f"{run['crash_offset_seconds'] / 60:.1f}분" if run["crash_offset_seconds"] is not None else "-"
+                print(f"{run['run_id']:<40}{run['start_time'] or 'N/A':<28}{run['data_points']:>8}"
+                      f"{run['peak_memory']:>11.1f}%{crash:>10}")
+
+        elif args.command == "compare":
+            print("\n=== 임계점 도달 시간 비교 ===")
+            print(catalog.compare_table(args.runs))
+            catalog.create_comparison_chart(args.runs, args.align, args.output)
+
+    except KeyError as e:
+        print(f"비교 오류: {e}")
+    finally:
+        catalog.close()
+
+if __name__ == "__main__":
+    main()
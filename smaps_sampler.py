@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+대상 프로세스 메모리 구성 샘플러
+/proc/<pid>/smaps_rollup에서 익명(anon), 파일 기반(file), 공유 메모리(shmem), 스왑 메모리의 PSS를,
+/proc/<pid>/status에서 스레드 수를, /proc/net/sockstat에서 시스템 전체 소켓 버퍼 메모리를 읽습니다.
+smaps_rollup 읽기는 커널이 전체 매핑을 순회하므로 비용이 크기 때문에 최소 간격으로 제한합니다.
+"""
+
+import os
+import time
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# smaps_rollup 항목 -> 결과 키 (kB 단위, 누적 그래프에서 합산할 수 있도록 모두 PSS 기준)
+SMAPS_FIELDS = {
+    "Pss_Anon": "anon_mb",
+    "Pss_File": "file_mb",
+    "Pss_Shmem": "shmem_mb",
+    "SwapPss": "swap_mb"
+}
+
+# Pss_Anon/SwapPss가 없는 커널(5.x 이전)에서 사용하는 비 PSS 대체 항목
+SMAPS_FALLBACK_FIELDS = {
+    "Anonymous": "anon_mb",
+    "Swap": "swap_mb"
+}
+
+BREAKDOWN_KEYS = ("anon_mb", "file_mb", "shmem_mb", "swap_mb", "threads", "sock_mem_mb")
+
+def read_smaps_rollup(pid):
+    """smaps_rollup에서 메모리 구성 읽기 (MB)"""
+    values = {key: 0.0 for key in SMAPS_FIELDS.values()}
+    fallback = {}
+    found = set()
+    with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+        for line in f:
+            field, _, rest = line.partition(":")
+            if field in SMAPS_FIELDS:
+                values[SMAPS_FIELDS[field]] = int(rest.split()[0]) / 1024
+                found.add(SMAPS_FIELDS[field])
+            elif field in SMAPS_FALLBACK_FIELDS:
+                fallback[SMAPS_FALLBACK_FIELDS[field]] = int(rest.split()[0]) / 1024
+    for key, value in fallback.items():
+        if key not in found:
+            values[key] = value
+    return values
+
+def read_thread_count(pid):
+    """스레드 수 (/proc/<pid>/status Threads)"""
+    with open(f"/proc/{pid}/status", 'r') as f:
+        for line in f:
+            if line.startswith("Threads:"):
+                return int(line.split()[1])
+    return 0
+
+def read_socket_memory_mb():
+    """시스템 전체 TCP/UDP 소켓 버퍼 메모리 (/proc/net/sockstat의 mem 항목, 페이지 단위, 대상 프로세스만의 값이 아님)"""
+    pages = 0
+    with open("/proc/net/sockstat", 'r') as f:
+        for line in f:
+            protocol, _, rest = line.partition(":")
+            if protocol not in ("TCP", "UDP"):
+                continue
+            fields = rest.split()
+            for name, value in zip(fields[::2], fields[1::2]):
+                if name == "mem":
+                    pages += int(value)
+    return pages * PAGE_SIZE / (1024 * 1024)
+
+class SmapsSampler:
+    def __init__(self, pid, min_interval=5.0):
+        """
+        메모리 구성 샘플러
+
+        Args:
+            pid: 대상 프로세스 PID
+            min_interval: smaps_rollup 최소 읽기 간격 (초)
+        """
+        self.pid = pid
+        self.min_interval = min_interval
+        self.last_sample_time = None
+        self.last_breakdown = {key: 0.0 for key in BREAKDOWN_KEYS}
+
+    def sample(self):
+        """
+        메모리 구성 샘플 (최소 간격 이내에는 마지막 값을 반환)
+
+        Returns:
+            (구성 dict, 새로 읽었는지 여부)
+        """
+        now = time.monotonic()
+        if self.last_sample_time is not None and now - self.last_sample_time < self.min_interval:
+            return self.last_breakdown, False
+
+        breakdown = read_smaps_rollup(self.pid)
+        breakdown["threads"] = read_thread_count(self.pid)
+        breakdown["sock_mem_mb"] = read_socket_memory_mb()
+
+        self.last_sample_time = now
+        self.last_breakdown = breakdown
+        return breakdown, True
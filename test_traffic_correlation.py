@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+traffic_correlation 결합 프레임 테스트
+"""
+
+import numpy as np
+
+from traffic_correlation import MONITOR_SERIES, TrafficCorrelation
+
+def make_packets(epoch_seconds):
+    """epoch 초 목록 -> analyze_packets 형식 패킷 목록"""
+    return [{"timestamp": "", "timestamp_epoch": f"{second}.000000000", "length": "60",
+             "protocol": "6", "src_ip": "127.0.0.1", "dst_ip": "127.0.0.2",
+             "src_port": "40000", "dst_port": "2152", "payload": ""}
+            for second in epoch_seconds]
+
+def test_tolerance_without_samples():
+    """모니터링 샘플 없이 허용 지연을 지정해도 리소스 컬럼은 모두 NaN"""
+    correlation = TrafficCorrelation(bucket_seconds=1.0, tolerance_seconds=2.0)
+    correlation.load_packets(make_packets([1760950359, 1760950360, 1760950362]))
+    correlation.load_monitor({"data": {"timestamps": []}})
+
+    frame = correlation.build_frame()
+
+    assert len(frame) == 4
+    assert frame["packets"].tolist() == [1, 1, 0, 1]
+    for key in MONITOR_SERIES:
+        assert np.isnan(frame[key]).all()
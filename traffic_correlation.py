@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+캡처 트래픽과 리소스 모니터링 시간 정렬 결합
+캡처 분석(tshark frame.time 문자열)과 모니터링 샘플(ISO datetime)을 같은 ns 정수 시간축
+(두 데이터 중 가장 이른 시각 = 0)으로 변환한 뒤, 설정한 버킷 크기마다 패킷/바이트 속도를 집계하고
+각 버킷 끝 시점 기준 가장 최근 모니터링 샘플(as-of)을 붙여 하나의 프레임으로 만듭니다.
+어떤 트래픽 구간이 각 메모리/CPU/연결 변화를 일으켰는지 버킷 단위로 확인할 수 있습니다.
+"""
+
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from flow_table import FlowTable, distinct_flow_counts
+from monitor_archive import load_monitor_data
+
+# 결합할 모니터링 시계열
+MONITOR_SERIES = ("memory_usage", "cpu_usage", "connections")
+
+def iso_to_epoch_ns(timestamps):
+    """
+    ISO 형식 로컬 시각 목록 -> epoch 나노초 배열
+    numpy datetime64 변환(시간대 없는 값)에 로컬 UTC 오프셋을 적용하며,
+    구간 중 오프셋이 바뀌면(서머타임) 샘플별 오프셋을 사용합니다.
+    """
+    if not timestamps:
+        return np.array([], dtype=np.int64)
+
+    naive_ns = np.array(timestamps, dtype="datetime64[ns]").astype(np.int64)
+
+    def utc_offset_ns(timestamp):
+        offset = datetime.fromisoformat(timestamp).astimezone().utcoffset()
+        return int(offset.total_seconds() * 1e9)
+
+    first_offset = utc_offset_ns(timestamps[0])
+    if utc_offset_ns(timestamps[-1]) == first_offset:
+        return naive_ns - first_offset
+    return naive_ns - np.array([utc_offset_ns(t) for t in timestamps], dtype=np.int64)
+
+class TrafficCorrelation:
+    def __init__(self, bucket_seconds=1.0, tolerance_seconds=None):
+        """
+        트래픽/리소스 시간 정렬 결합
+
+        Args:
+            bucket_seconds: 집계 버킷 크기 (초)
+            tolerance_seconds: as-of 결합 시 허용하는 최대 샘플 지연 (초, None이면 제한 없음)
+        """
+        self.bucket_ns = int(bucket_seconds * 1e9)
+        if self.bucket_ns <= 0:
+            raise ValueError("버킷 크기는 0보다 커야 합니다.")
+        self.tolerance_ns = int(tolerance_seconds * 1e9) if tolerance_seconds else None
+
+        self.packet_ns = np.array([], dtype=np.int64)
+        self.packet_bytes = np.array([], dtype=np.int64)
+        self.packet_flows = np.array([], dtype=np.int64)
+        self.sample_ns = np.array([], dtype=np.int64)
+        self.samples = {}
+        self.origin_ns = None
+        self.frame = None
+
+    def load_flow_table(self, table):
+        """FlowTable의 패킷 테이블을 트래픽 입력으로 사용"""
+        self.packet_ns = table.packets["ts_ns"]
+        self.packet_bytes = table.packets["length"].astype(np.int64)
+        self.packet_flows = table.packets["flow_id"]
+
+    def load_packets(self, packet_dicts):
+        """analyze_packets의 all_packets 목록을 트래픽 입력으로 사용"""
+        self.load_flow_table(FlowTable.from_packets(packet_dicts))
+
+    def load_monitor(self, data):
+        """모니터링 데이터(load_monitor_data 결과)를 리소스 입력으로 사용"""
+        data_points = data.get("data", {})
+        timestamps = data_points.get("timestamps", [])
+        self.sample_ns = iso_to_epoch_ns(timestamps)
+
+        order = np.argsort(self.sample_ns, kind="stable")
+        self.sample_ns = self.sample_ns[order]
+        self.samples = {}
+        for key in MONITOR_SERIES:
+            values = data_points.get(key, [])
+            if len(values) == len(timestamps):
+                self.samples[key] = np.asarray(values, dtype=np.float64)[order]
+
+    def build_frame(self):
+        """
+        버킷별 트래픽/리소스 결합 프레임 생성
+
+        Returns:
+            pandas DataFrame (offset_ns = 공통 시간축 버킷 시작, 그 외 버킷별 값)
+        """
+        inputs = [values for values in (self.packet_ns, self.sample_ns) if len(values)]
+        if not inputs:
+            raise ValueError("결합할 트래픽 또는 모니터링 데이터가 없습니다.")
+
+        # 공통 시간축: 두 입력 중 가장 이른 시각을 0으로
+        self.origin_ns = int(min(values.min() for values in inputs))
+        end_ns = int(max(values.max() for values in inputs))
+        bucket_count = (end_ns - self.origin_ns) // self.bucket_ns + 1
+        bucket_seconds = self.bucket_ns / 1e9
+
+        bucket_starts = np.arange(bucket_count, dtype=np.int64) * self.bucket_ns
+        frame = {
+            "offset_ns": bucket_starts,
+            "time": pd.to_datetime(bucket_starts + self.origin_ns, unit="ns", utc=True)
+                      .tz_convert(datetime.now().astimezone().tzinfo).tz_localize(None)
+        }
+
+        # 트래픽 집계: 버킷 인덱스별 bincount
+        packet_buckets = (self.packet_ns - self.origin_ns) // self.bucket_ns
+        frame["packets"] = np.bincount(packet_buckets, minlength=bucket_count)
+        frame["packet_rate"] = frame["packets"] / bucket_seconds
+        frame["byte_rate"] = np.bincount(packet_buckets, weights=self.packet_bytes, minlength=bucket_count) / bucket_seconds
+
+        frame["active_flows"] = distinct_flow_counts(packet_buckets, self.packet_flows, bucket_count)
+
+        # as-of 결합: 버킷 끝 이전의 가장 최근 샘플
+        sample_offsets = self.sample_ns - self.origin_ns
+        bucket_ends = bucket_starts + self.bucket_ns
+        latest = np.searchsorted(sample_offsets, bucket_ends, side="left") - 1
+        valid = latest >= 0
+        if len(sample_offsets) == 0:
+            valid[:] = False
+        elif self.tolerance_ns is not None:
+            valid &= bucket_ends - sample_offsets[np.maximum(latest, 0)] <= self.tolerance_ns
+
+        for key in MONITOR_SERIES:
+            column = np.full(bucket_count, np.nan)
+            if key in self.samples:
+                column[valid] = self.samples[key][latest[valid]]
+            frame[key] = column
+
+        self.frame = pd.DataFrame(frame)
+        return self.frame
+
+    def resource_changes(self, column="memory_usage", top=5, lookback=3):
+        """
+        리소스 증가가 가장 큰 버킷과 직전 트래픽 비교
+
+        Args:
+            column: 리소스 컬럼
+            top: 출력할 버킷 수
+            lookback: 평균 트래픽을 비교할 직전 버킷 수
+        """
+        frame = self.frame if self.frame is not None else self.build_frame()
+        deltas = frame[column].diff()
+        preceding_rate = frame["packet_rate"].shift(1).rolling(lookback, min_periods=1).mean()
+
+        changes = pd.DataFrame({
+            "time": frame["time"],
+            "offset_s": frame["offset_ns"] / 1e9,
+            "delta": deltas,
+            "value": frame[column],
+            "packet_rate": frame["packet_rate"],
+            "preceding_packet_rate": preceding_rate,
+            "active_flows": frame["active_flows"]
+        })
+        return changes.dropna(subset=["delta"]).nlargest(top, "delta")
+
+    def create_chart(self, output_file=None):
+        """트래픽/리소스 시간 정렬 차트"""
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['axes.unicode_minus'] = False
+
+        frame = self.frame if self.frame is not None else self.build_frame()
+        seconds = frame["offset_ns"] / 1e9
+
+        fig, axes = plt.subplots(3, 1, figsize=(16, 14), sharex=True)
+        fig.suptitle(f'Traffic vs Resources ({self.bucket_ns / 1e9:g}s buckets)', fontsize=18, fontweight='bold')
+
+        axes[0].plot(seconds, frame["packet_rate"], color='tab:blue', linewidth=1.5, label='Packets/s')
+        axes[0].set_ylabel('Packets/s', fontsize=12)
+        byte_axis = axes[0].twinx()
+        byte_axis.plot(seconds, frame["byte_rate"] / 1024, color='tab:orange', linewidth=1.2, alpha=0.7, label='KB/s')
+        byte_axis.set_ylabel('KB/s', fontsize=12)
+        axes[0].legend(loc='upper left')
+        byte_axis.legend(loc='upper right')
+
+        axes[1].plot(seconds, frame["memory_usage"], color='tab:red', linewidth=2, label='Memory (%)')
+        axes[1].plot(seconds, frame["cpu_usage"], color='tab:green', linewidth=1.5, label='CPU (%)')
+        axes[1].set_ylabel('Usage (%)', fontsize=12)
+        axes[1].set_ylim(0, 100)
+        axes[1].legend()
+
+        axes[2].plot(seconds, frame["connections"], color='tab:purple', linewidth=2, label='Connections')
+        axes[2].plot(seconds, frame["active_flows"], color='tab:gray', linewidth=1.2, alpha=0.8, label='Active flows')
+        axes[2].set_ylabel('Count', fontsize=12)
+        axes[2].set_xlabel('Time (seconds)', fontsize=12)
+        axes[2].legend()
+
+        for ax in axes:
+            ax.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        if not output_file:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            output_file = f"traffic_correlation_{timestamp}.png"
+        plt.savefig(output_file, dpi=150, bbox_inches='tight')
+        plt.close(fig)
+        print(f"상관 차트 저장: {output_file}")
+        return output_file
+
+    def save_frame(self, filename=None):
+        """결합 프레임 CSV 저장"""
+        frame = self.frame if self.frame is not None else self.build_frame()
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"traffic_correlation_{timestamp}.csv"
+        frame.to_csv(filename, index=False)
+        print(f"결합 프레임 저장: {filename}")
+        return filename
+
+def main():
+    """메인 함수"""
+    import json
+    from capture_ue_packets import UEPacketCapture, PARSER_BACKENDS
+
+    parser = argparse.ArgumentParser(description="캡처 트래픽과 리소스 모니터링 시간 정렬 결합")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--capture", help="pcap 캡처 파일")
+    source.add_argument("--analysis", help="ue_packet_analysis_*.json 분석 결과 파일")
+    source.add_argument("--flows", help="흐름 테이블 (.npz)")
+    parser.add_argument("--monitor", required=True, help="모니터링 데이터 (JSON 또는 .ltearc 아카이브)")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="python", help="--capture 사용 시 패킷 파서")
+    parser.add_argument("--bucket", type=float, default=1.0, help="집계 버킷 크기 (초)")
+    parser.add_argument("--tolerance", type=float, default=None, help="as-of 결합 최대 샘플 지연 (초)")
+    parser.add_argument("--top", type=int, default=5, help="출력할 메모리 증가 구간 수")
+    parser.add_argument("--output", default=None, help="결합 프레임 CSV 파일명")
+    parser.add_argument("--chart", action="store_true", help="시간 정렬 차트 생성")
+
+    args = parser.parse_args()
+
+    correlation = TrafficCorrelation(args.bucket, args.tolerance)
+
+    try:
+        if args.capture:
+            capture = UEPacketCapture()
+            capture.capture_file = args.capture
+            analysis_result = capture.analyze_packets(args.parser)
+            if not analysis_result:
+                print("패킷 분석 실패")
+                return
+            correlation.load_packets(analysis_result["all_packets"])
+        elif args.analysis:
+            with open(args.analysis, 'r', encoding='utf-8') as f:
+                correlation.load_packets(json.load(f).get("all_packets", []))
+        else:
+            correlation.load_flow_table(FlowTable.load(args.flows))
+
+        correlation.load_monitor(load_monitor_data(args.monitor))
+        frame = correlation.build_frame()
+    except (OSError, ValueError) as e:
+        print(f"결합 오류: {e}")
+        return
+
+    print(f"버킷 수: {len(frame)} ({args.bucket:g}초), 패킷 수: {len(correlation.packet_ns)}, "
+          f"모니터링 샘플 수: {len(correlation.sample_ns)}")
+
+    print(f"\n=== 메모리 증가 상위 {args.top}개 구간 ===")
+    for _, row in correlation.resource_changes(top=args.top).iterrows():
+        print(f"{row['offset_s']:>10.1f}s  메모리 {row['value']:6.1f}% ({row['delta']:+.2f}%p)  "
+              f"패킷 {row['packet_rate']:.0f}/s (직전 {row['preceding_packet_rate']:.0f}/s)  "
+              f"활성 흐름 {row['active_flows']:.0f}")
+
+    correlation.save_frame(args.output)
+    if args.chart:
+        correlation.create_chart()
+
+if __name__ == "__main__":
+    main()